@@ -0,0 +1,248 @@
+"""
+Offline benchmark of every pipeline stage on synthetic D1-scale data.
+
+Generates Sports-Reference-shaped team pages (generate_synthetic_sportsref.py),
+then runs parse -> load -> schema -> season stats -> roster update ->
+similarity in-process against a scratch SQLite DB, timing each stage.
+
+With --games N, every player also gets an N-game log page, and the game log
+stages are timed too: a first load of all but each player's last game, then
+an incremental refresh that adds that last game (as after a night of games).
+
+Each run appends one JSON line to the results file with wall time, rows/sec
+and peak RSS per stage. If a baseline exists for the same data size, stages
+that got slower than --tolerance are flagged as regressions.
+
+The data is always one season (2024-25): similarity and the views only cover
+that season, so extra seasons would time the parse and load on rows the
+later stages ignore.
+
+Usage:
+    python scripts/benchmark_pipeline.py                      # 360 teams
+    python scripts/benchmark_pipeline.py --save-baseline
+    python scripts/benchmark_pipeline.py --fail-on-regression
+    python scripts/benchmark_pipeline.py --teams 60 --games 30
+"""
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import platform
+import sqlite3
+import sys
+import time
+
+import compute_sunbelt_2024_25_similarity as similarity
+from generate_synthetic_sportsref import generate
+import init_sun_belt_v0_schema as schema
+import init_sunbelt_v0_game_logs as game_logs
+import init_sunbelt_v0_season_stats as season_stats
+import init_sunbelt_v0_team_season_stats as team_stats
+import load_sunbelt_2024_25_sqlite as load
+import parse_sportsref_sunbelt_2024_25 as parse_per_game
+import parse_sportsref_sunbelt_2024_25_gamelogs as parse_gamelogs
+import parse_sportsref_sunbelt_2024_25_rosters as parse_rosters
+from stage_metrics import instrument_stage
+import update_players_from_sunbelt_rosters_2024_25 as roster_update
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = PROJECT_ROOT / "ncaa-analytics" / "bench"
+RAW_DIR = BENCH_DIR / "data_raw"
+DB_PATH = BENCH_DIR / "bench.db"
+RESULTS_PATH = BENCH_DIR / "results.jsonl"
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+
+DEFAULT_TOLERANCE = 0.25  # flag stages >25% slower than baseline
+MIN_REGRESSION_SECONDS = 0.1  # ignore jitter on stages too quick to measure
+SEASONS = 1  # the stages after load are 2024-25 only
+
+
+# -------------------------
+# Stages
+# -------------------------
+
+def time_stage(results: dict, name: str, fn):
+    """Run fn() -> (value, rows) and record wall time, rows/sec and peak RSS."""
+    with instrument_stage(name, path=None) as m:
+        value, rows = fn()
+    seconds = m.wall_seconds
+    results[name] = {
+        "seconds": seconds,
+        "cpu_seconds": m.cpu_seconds,
+        "rows": rows,
+        "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": m.peak_rss_mb,
+    }
+    print(
+        f"  {name:<15} {seconds:8.2f}s  {rows:>9} rows  "
+        f"{m.peak_rss_mb:8.1f} MB"
+    )
+    return value
+
+
+def run_stages(raw_dir: Path, db_path: Path, games: bool = False) -> dict:
+    if db_path.exists():
+        db_path.unlink()
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+    def count(table):
+        return conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+
+    def parse_step():
+        df, totals = parse_per_game.parse_all_teams(write_csvs=False, raw_dir=raw_dir)
+        if totals is not None:
+            totals = load.normalize_columns(totals)
+        return (load.normalize_columns(df), totals), len(df)
+
+    def load_step():
+        load.write_table(conn, per_game)
+        if team_totals is not None:
+            load.write_team_totals(conn, team_totals)
+        return None, len(per_game)
+
+    def parse_rosters_step():
+        df = parse_rosters.parse_all_rosters(raw_dir=raw_dir, pattern="*.html")
+        return roster_update.normalize_roster(df), len(df)
+
+    def similarity_step():
+        features = similarity.load_player_features(conn)
+        sim_df = similarity.compute_similarity(features)
+        similarity.write_similarity(conn, sim_df)
+        return None, len(features)
+
+    all_games = earlier_games = None
+
+    def parse_gamelogs_step():
+        nonlocal all_games, earlier_games
+        all_games = parse_gamelogs.parse_all_gamelogs(
+            raw_dir=raw_dir / "gamelogs", pattern="*.html")
+        latest = all_games.groupby(["team_slug", "player"])["game_date"].transform("max")
+        earlier_games = all_games[all_games["game_date"] < latest]
+        return None, len(all_games)
+
+    def game_logs_step(df):
+        written, _, _ = game_logs.apply_game_logs(conn, df)
+        return None, written
+
+    results = {}
+    try:
+        per_game, team_totals = time_stage(results, "parse", parse_step)
+        rosters = time_stage(results, "parse_rosters", parse_rosters_step)
+        time_stage(results, "load", load_step)
+        time_stage(results, "schema",
+                   lambda: (schema.build_schema(conn), count("players")))
+        time_stage(results, "season_stats",
+                   lambda: (season_stats.build_season_stats(conn),
+                            count("player_season_stats")))
+        time_stage(results, "team_stats",
+                   lambda: (team_stats.refresh_team_stats(conn), count("team_season_stats")))
+        time_stage(results, "roster_update",
+                   lambda: (roster_update.apply_roster(conn, rosters), len(rosters)))
+        time_stage(results, "similarity", similarity_step)
+        if games:
+            time_stage(results, "parse_gamelogs", parse_gamelogs_step)
+            time_stage(results, "game_logs", lambda: game_logs_step(earlier_games))
+            time_stage(results, "game_logs_incr", lambda: game_logs_step(all_games))
+    finally:
+        conn.close()
+    return results
+
+
+# -------------------------
+# Baseline comparison
+# -------------------------
+
+def find_regressions(stages: dict, baseline: dict, tolerance: float) -> list[str]:
+    flagged = []
+    for name, stats in stages.items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or not base.get("seconds"):
+            continue
+        ratio = stats["seconds"] / base["seconds"]
+        if (ratio > 1 + tolerance
+                and stats["seconds"] - base["seconds"] > MIN_REGRESSION_SECONDS):
+            flagged.append(
+                f"{name}: {base['seconds']:.2f}s -> {stats['seconds']:.2f}s "
+                f"(+{ratio - 1:.0%})"
+            )
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=360)
+    parser.add_argument("--players", type=int, default=14, help="players per team")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=0,
+                        help="games per player game log (0 = skip game log stages)")
+    parser.add_argument("--results", type=Path, default=RESULTS_PATH)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the baseline for its data size")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    config = {
+        "teams": args.teams,
+        "seasons": SEASONS,
+        "players_per_team": args.players,
+        "seed": args.seed,
+        "games": args.games,
+    }
+    config_key = f"{args.teams}x{SEASONS}x{args.players}"
+    if args.games:
+        config_key += f"x{args.games}g"
+
+    print(f"Generating {args.teams} teams ...")
+    start = time.perf_counter()
+    pages = generate(RAW_DIR, args.teams, SEASONS, args.players, args.seed, args.games)
+    print(f"  {len(pages)} pages in {time.perf_counter() - start:.1f}s\n")
+
+    print("Stage timings:")
+    stages = run_stages(RAW_DIR, DB_PATH, games=args.games > 0)
+
+    record = {
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "config": config,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "stages": stages,
+        "total_seconds": round(sum(s["seconds"] for s in stages.values()), 4),
+    }
+
+    baselines = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = []
+    if config_key in baselines:
+        regressions = find_regressions(stages, baselines[config_key], args.tolerance)
+    record["regressions"] = regressions
+
+    args.results.parent.mkdir(parents=True, exist_ok=True)
+    with args.results.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"\nTotal {record['total_seconds']:.2f}s; appended results to {args.results}")
+
+    if config_key not in baselines:
+        print(f"No baseline for {config_key} (use --save-baseline).")
+    elif regressions:
+        print("REGRESSIONS vs baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+    else:
+        print(f"No regressions vs baseline {config_key}.")
+
+    if args.save_baseline:
+        baselines[config_key] = record
+        args.baseline.write_text(json.dumps(baselines, indent=2), encoding="utf-8")
+        print(f"Saved baseline {config_key} to {args.baseline}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
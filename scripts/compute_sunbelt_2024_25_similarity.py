@@ -4,18 +4,21 @@ import sqlite3
 import numpy as np
 import pandas as pd
 
+from stage_metrics import instrument_stage
+from warehouse_snapshots import connect_writable
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 
 VIEW_NAME = "v_sun_belt_player_season_2024_25"
 SIM_TABLE = "player_similarity_sun_belt_2024_25"
 
+FEATURE_COLS = ["pts", "ast", "trb", "stl", "blk", "mp", "ts_pct"]
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
 
-    # 1. Load player-season data from the view
-    df = pd.read_sql_query(
+def load_player_features(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Load player-season data from the view."""
+    return pd.read_sql_query(
         f"""
         SELECT
             player_id,
@@ -35,21 +38,22 @@ def main():
         conn,
     )
 
+
+def compute_similarity(df: pd.DataFrame, k: int = 5) -> pd.DataFrame:
+    """Top-k nearest neighbours per player on z-scored box-score features."""
     # --- feature matrix ---
-    feature_cols = ["pts", "ast", "trb", "stl", "blk", "mp", "ts_pct"]
-    X = df[feature_cols].fillna(0.0).to_numpy(dtype=float)
+    X = df[FEATURE_COLS].fillna(0.0).to_numpy(dtype=float)
 
-    # 2. Standardize (z-score)
+    # Standardize (z-score)
     means = X.mean(axis=0)
     stds = X.std(axis=0)
     stds[stds == 0] = 1.0  # avoid divide-by-zero
 
     X_norm = (X - means) / stds
 
-    # 3. Compute nearest neighbours (Euclidean distance)
+    # Compute nearest neighbours (Euclidean distance)
     records = []
     n = X_norm.shape[0]
-    k = 5  # top-5 comps per player
 
     for i in range(n):
         diffs = X_norm - X_norm[i]
@@ -70,10 +74,11 @@ def main():
                 }
             )
 
-    sim_df = pd.DataFrame(records)
-    print(f"Computed {len(sim_df)} similarity rows for {n} players.")
+    return pd.DataFrame(records)
 
-    # 4. Create / replace similarity table
+
+def write_similarity(conn: sqlite3.Connection, sim_df: pd.DataFrame) -> None:
+    """Create / replace the similarity table."""
     conn.execute(
         f"""
         CREATE TABLE IF NOT EXISTS {SIM_TABLE} (
@@ -94,6 +99,24 @@ def main():
     sim_df.to_sql(SIM_TABLE, conn, if_exists="append", index=False)
     conn.commit()
 
+
+def main():
+    conn = connect_writable(DB_PATH)
+
+    with instrument_stage("similarity") as m:
+        # 1. Load player-season data from the view
+        df = load_player_features(conn)
+        m.rows_in = len(df)
+
+        # 2-3. Standardize + nearest neighbours
+        sim_df = compute_similarity(df)
+        n = len(df)
+        print(f"Computed {len(sim_df)} similarity rows for {n} players.")
+
+        # 4. Create / replace similarity table
+        write_similarity(conn, sim_df)
+        m.rows_out = len(sim_df)
+
     # 5. Print a quick sample for sanity
     sample = df.sample(1, random_state=42).iloc[0]
     pid = int(sample["player_id"])
@@ -0,0 +1,306 @@
+"""
+Generate synthetic Sports-Reference-shaped team pages for benchmarking.
+
+Each page has the two tables the parsers look for: a roster table
+(Player / # / Class / Pos / Height / Weight) and a per-game table with the
+usual Sports-Reference columns plus a "Team Totals" row that adds up from the
+player lines. Some roster names are written differently from the per-game
+table (accents dropped, suffix removed) so the fuzzy name matcher gets
+exercised too.
+
+Output files are named {team_slug}_{year}.html, like the scraper's, so they
+can be fed straight into the parse functions. Everything is offline and
+deterministic for a given seed.
+
+With --games N, each player also gets a game log page of N games under
+gamelogs/{team_slug}__{player_slug}_{year}.html (named like the game log
+scraper's output), and roster names link to /cbb/players/{player_slug}.html.
+
+--seasons N writes the N seasons up to 2024-25. Only 2024-25 flows through
+the similarity and view stages; older seasons are for sizing the player and
+search tables.
+
+Usage:
+    python scripts/generate_synthetic_sportsref.py --teams 360 --seasons 2
+    python scripts/generate_synthetic_sportsref.py --teams 12 --games 30
+"""
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import re
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_OUT_DIR = PROJECT_ROOT / "ncaa-analytics" / "bench" / "data_raw"
+
+LATEST_YEAR = 2025
+
+PER_GAME_COLUMNS = [
+    "Rk", "Player", "Pos", "G", "GS", "MP", "FG", "FGA", "FG%", "3P", "3PA",
+    "3P%", "2P", "2PA", "2P%", "eFG%", "FT", "FTA", "FT%", "ORB", "DRB", "TRB",
+    "AST", "STL", "BLK", "TOV", "PF", "PTS", "Awards",
+]
+ROSTER_COLUMNS = ["Player", "#", "Class", "Pos", "Height", "Weight"]
+GAMELOG_COLUMNS = [
+    "Rk", "Gtm", "Date", "Team", "", "Opp", "Result", "GS", "MP", "FG", "FGA",
+    "FG%", "3P", "3PA", "3P%", "2P", "2PA", "2P%", "eFG%", "FT", "FTA", "FT%",
+    "ORB", "DRB", "TRB", "AST", "STL", "BLK", "TOV", "PF", "PTS", "GmSc",
+]
+
+FIRST_NAMES = [
+    "Aaron", "Andre", "Bobby", "Brandon", "Caleb", "Cameron", "Chris", "D'Andre",
+    "Darius", "Devin", "Elijah", "Isaiah", "Jalen", "Jamal", "Javier", "Jaylen",
+    "Jordan", "José", "Josh", "Kobe", "Malik", "Marcus", "Mike", "Nate", "Noah",
+    "Omar", "Quincy", "Rashad", "Sam", "Terrence", "Tyler", "Xavier", "Zion",
+]
+LAST_NAMES = [
+    "Allen", "Brown", "Clark", "Davis", "Dupré", "Edwards", "García", "Hall",
+    "Harris", "Jackson", "Johnson", "King", "Lee", "Martin", "Moore", "Muñoz",
+    "Nelson", "O'Brien", "Parker", "Robinson", "Scott", "Smith", "Taylor",
+    "Thomas", "Thompson", "Walker", "White", "Williams", "Wilson", "Young",
+]
+SUFFIXES = ["", "", "", "", "", "", " Jr.", " II", " III"]
+CLASSES = ["FR", "SO", "JR", "SR", "GR"]
+POSITIONS = ["G", "G", "F", "F", "C"]
+
+
+def team_slugs(n_teams: int) -> list[str]:
+    return [f"synthetic-{i:03d}" for i in range(1, n_teams + 1)]
+
+
+def player_slug(name: str, team_slug: str) -> str:
+    """Sports-Reference style player slug, unique per team."""
+    base = re.sub(r"[^a-z0-9]+", "-", strip_accents(name).lower()).strip("-")
+    return f"{base}-{team_slug.rsplit('-', 1)[-1]}"
+
+
+def strip_accents(name: str) -> str:
+    table = str.maketrans("áéíóúñüÁÉÍÓÚÑÜ", "aeiounuAEIOUNU")
+    return name.translate(table)
+
+
+def roster_variant(name: str, rng: random.Random) -> str:
+    """How the roster table might spell a per-game name."""
+    roll = rng.random()
+    if roll < 0.05:
+        return strip_accents(name)
+    if roll < 0.08:
+        for suffix in (" Jr.", " III", " II"):
+            if name.endswith(suffix):
+                return name[: -len(suffix)]
+    return name
+
+
+def make_player_names(rng: random.Random, n_players: int) -> list[str]:
+    names = set()
+    while len(names) < n_players:
+        names.add(
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.choice(SUFFIXES)}")
+    return sorted(names)
+
+
+def per_game_row(rk: int, name: str, rng: random.Random) -> list[str]:
+    g = rng.randint(10, 35)
+    gs = rng.randint(0, g)
+    mp = rng.uniform(3, 36)
+    fga = rng.uniform(0.5, 0.45 * mp)
+    fg3a = rng.uniform(0, fga * 0.6)
+    fg2a = fga - fg3a
+    fg3 = fg3a * rng.uniform(0.2, 0.45)
+    fg2 = fg2a * rng.uniform(0.35, 0.65)
+    fg = fg2 + fg3
+    fta = rng.uniform(0, 0.4 * fga + 0.5)
+    ft = fta * rng.uniform(0.5, 0.9)
+    orb = rng.uniform(0, 0.1 * mp)
+    drb = rng.uniform(0, 0.2 * mp)
+    pts = 2 * fg2 + 3 * fg3 + ft
+
+    def pct(made, att):
+        return f"{made / att:.3f}".lstrip("0") if att > 0 else ""
+
+    values = [
+        rk, name, rng.choice(POSITIONS), g, gs, f"{mp:.1f}",
+        f"{fg:.1f}", f"{fga:.1f}", pct(fg, fga),
+        f"{fg3:.1f}", f"{fg3a:.1f}", pct(fg3, fg3a),
+        f"{fg2:.1f}", f"{fg2a:.1f}", pct(fg2, fg2a),
+        pct(fg + 0.5 * fg3, fga),
+        f"{ft:.1f}", f"{fta:.1f}", pct(ft, fta),
+        f"{orb:.1f}", f"{drb:.1f}", f"{orb + drb:.1f}",
+        f"{rng.uniform(0, 0.2 * mp):.1f}", f"{rng.uniform(0, 2):.1f}",
+        f"{rng.uniform(0, 2):.1f}", f"{rng.uniform(0, 3):.1f}",
+        f"{rng.uniform(0, 4):.1f}", f"{pts:.1f}", "",
+    ]
+    return [str(v) for v in values]
+
+
+def team_totals_row(rows: list[list[str]]) -> list[str]:
+    """Sports-Reference "Team Totals" line: player games x per-game, over team games."""
+    col = {c: i for i, c in enumerate(PER_GAME_COLUMNS)}
+    team_g = max(int(r[col["G"]]) for r in rows)
+
+    def total(c):
+        return sum(int(r[col["G"]]) * float(r[col[c]]) for r in rows) / team_g
+
+    def pct(made, att):
+        return f"{total(made) / total(att):.3f}".lstrip("0") if total(att) > 0 else ""
+
+    values = {c: f"{total(c):.1f}" for c in (
+        "MP", "FG", "FGA", "3P", "3PA", "2P", "2PA", "FT", "FTA",
+        "ORB", "DRB", "TRB", "AST", "STL", "BLK", "TOV", "PF", "PTS")}
+    values.update({
+        "Player": "Team Totals", "G": str(team_g),
+        "FG%": pct("FG", "FGA"), "3P%": pct("3P", "3PA"), "2P%": pct("2P", "2PA"),
+        "FT%": pct("FT", "FTA"),
+        "eFG%": f"{(total('FG') + 0.5 * total('3P')) / total('FGA'):.3f}".lstrip("0"),
+    })
+    return [values.get(c, "") for c in PER_GAME_COLUMNS]
+
+
+def html_table(table_id: str, columns: list[str], rows: list[list[str]]) -> str:
+    head = "".join(f"<th>{c}</th>" for c in columns)
+    body = "\n".join(
+        "<tr>" + "".join(f"<td>{v}</td>" for v in row) + "</tr>" for row in rows)
+    return (
+        f'<table class="sortable stats_table" id="{table_id}">\n'
+        f"<thead><tr>{head}</tr></thead>\n<tbody>\n{body}\n</tbody>\n</table>"
+    )
+
+
+def gamelog_row(rk: int, day: date, opp: str, rng: random.Random) -> list[str]:
+    mp = rng.randint(4, 38)
+    fg3a = rng.randint(0, mp // 5)
+    fg2a = rng.randint(0, mp // 3)
+    fg3 = rng.randint(0, fg3a)
+    fg2 = rng.randint(0, fg2a)
+    fta = rng.randint(0, 8)
+    ft = rng.randint(0, fta)
+    orb, drb = rng.randint(0, 4), rng.randint(0, 8)
+    fg, fga = fg2 + fg3, fg2a + fg3a
+
+    def pct(made, att):
+        return f"{made / att:.3f}".lstrip("0") if att else ""
+
+    pts = 2 * fg2 + 3 * fg3 + ft
+    team_score, opp_score = rng.randint(55, 95), rng.randint(55, 95)
+    result = f"{'W' if team_score > opp_score else 'L'} {team_score}-{opp_score}"
+    values = [
+        rk, rk, day.isoformat(), "", rng.choice(["", "@", "N"]), opp, result,
+        rng.randint(0, 1), mp, fg, fga, pct(fg, fga), fg3, fg3a, pct(fg3, fg3a),
+        fg2, fg2a, pct(fg2, fg2a), pct(fg + 0.5 * fg3, fga), ft, fta, pct(ft, fta),
+        orb, drb, orb + drb, rng.randint(0, 8), rng.randint(0, 3), rng.randint(0, 3),
+        rng.randint(0, 4), rng.randint(0, 5), pts, f"{pts * 0.7:.1f}",
+    ]
+    return [str(v) for v in values]
+
+
+def render_gamelog_page(
+    name: str, team_slug: str, year: int, n_games: int, rng: random.Random
+) -> str:
+    day = date(year - 1, 11, 4)
+    rows = []
+    for rk in range(1, n_games + 1):
+        opp = f"synthetic-{rng.randint(1, 360):03d}"
+        if rng.random() < 0.04:
+            rows.append([str(rk), "", day.isoformat(), "", "", opp, "W 70-60",
+                         "Did Not Play"] + [""] * (len(GAMELOG_COLUMNS) - 8))
+        else:
+            rows.append(gamelog_row(rk, day, opp, rng))
+        day += timedelta(days=rng.randint(2, 4))
+
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"></head>\n<body>\n"
+        f"<h1><span>{name} {year - 1}-{str(year)[-2:]} Game Log</span></h1>\n"
+        + html_table("player_game_log", GAMELOG_COLUMNS, rows)
+        + "\n</body></html>\n"
+    )
+
+
+def render_team_page(
+    team_slug: str, year: int, n_players: int, rng: random.Random,
+    names: list[str] | None = None,
+) -> str:
+    names = names or make_player_names(rng, n_players)
+
+    def linked(name):
+        slug = player_slug(name, team_slug)
+        return f'<a href="/cbb/players/{slug}.html">{roster_variant(name, rng)}</a>'
+
+    roster_rows = [
+        [
+            linked(name), str(rng.randint(0, 55)),
+            rng.choice(CLASSES), rng.choice(POSITIONS),
+            f"6-{rng.randint(0, 11)}" if rng.random() < 0.8 else f"7-{rng.randint(0, 2)}",
+            str(rng.randint(165, 260)),
+        ]
+        for name in names
+    ]
+
+    per_game_rows = [per_game_row(i, name, rng) for i, name in enumerate(names, 1)]
+    per_game_rows.append(team_totals_row(per_game_rows))
+
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>{year - 1}-{str(year)[-2:]} {team_slug} Men's Stats</title></head>\n"
+        "<body>\n<div id=\"all_roster\">\n"
+        + html_table("roster", ROSTER_COLUMNS, roster_rows)
+        + "\n</div>\n<div id=\"all_players_per_game\">\n"
+        + html_table("players_per_game", PER_GAME_COLUMNS, per_game_rows)
+        + "\n</div>\n</body></html>\n"
+    )
+
+
+def generate(
+    out_dir: Path,
+    n_teams: int = 360,
+    n_seasons: int = 1,
+    n_players: int = 14,
+    seed: int = 0,
+    n_games: int = 0,
+) -> list[Path]:
+    """
+    Write n_teams x n_seasons team pages into out_dir (plus game logs under
+    out_dir/gamelogs when n_games > 0); returns the team page paths.
+    """
+    gamelog_dir = out_dir / "gamelogs"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in [*out_dir.glob("*.html"), *gamelog_dir.glob("*.html")]:
+        stale.unlink()
+    if n_games:
+        gamelog_dir.mkdir(exist_ok=True)
+
+    rng = random.Random(seed)
+    paths = []
+    for offset in range(n_seasons):
+        year = LATEST_YEAR - offset
+        for slug in team_slugs(n_teams):
+            names = make_player_names(rng, n_players)
+            path = out_dir / f"{slug}_{year}.html"
+            path.write_text(render_team_page(slug, year, n_players, rng, names),
+                            encoding="utf-8")
+            paths.append(path)
+            for name in names if n_games else ():
+                log_path = gamelog_dir / f"{slug}__{player_slug(name, slug)}_{year}.html"
+                log_path.write_text(render_gamelog_page(name, slug, year, n_games, rng),
+                                    encoding="utf-8")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic team pages.")
+    parser.add_argument("--teams", type=int, default=360)
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--players", type=int, default=14, help="players per team")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", type=int, default=0,
+                        help="games per player game log (0 = no game logs)")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    args = parser.parse_args()
+
+    paths = generate(args.out, args.teams, args.seasons, args.players, args.seed, args.games)
+    print(f"Wrote {len(paths)} synthetic team pages to {args.out}")
+    if args.games:
+        print(f"  plus {args.games}-game logs for every player in {args.out / 'gamelogs'}")
+
+
+if __name__ == "__main__":
+    main()
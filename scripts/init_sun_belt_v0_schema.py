@@ -1,15 +1,27 @@
 from pathlib import Path
 import sqlite3
 
+from stage_metrics import instrument_stage
+from warehouse_snapshots import connect_writable
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 
 STATS_TABLE = "player_per_game_sun_belt_2024_25"
 
 
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
+def ensure_class_year_column(conn: sqlite3.Connection):
+    cur = conn.cursor()
+    cur.execute("PRAGMA table_info(players);")
+    cols = [row[1] for row in cur.fetchall()]
+    if "class_year" not in cols:
+        print("Adding players.class_year column ...")
+        cur.execute("ALTER TABLE players ADD COLUMN class_year TEXT;")
+        conn.commit()
+
+
+def build_schema(conn: sqlite3.Connection) -> None:
+    """Create teams + players and seed them from the per-game fact table."""
     cur = conn.cursor()
 
     # -------------------------
@@ -75,6 +87,18 @@ def main():
 
     conn.commit()
 
+
+def main():
+    conn = connect_writable(DB_PATH)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    cur = conn.cursor()
+    with instrument_stage("schema") as m:
+        cur.execute(f"SELECT COUNT(*) FROM {STATS_TABLE};")
+        m.rows_in = cur.fetchone()[0]
+        build_schema(conn)
+        cur.execute("SELECT COUNT(*) FROM players;")
+        m.rows_out = cur.fetchone()[0]
+
     # Simple sanity prints
     cur.execute("SELECT COUNT(*) FROM teams;")
     print("teams:", cur.fetchone()[0])
@@ -0,0 +1,428 @@
+"""
+Load player game logs into player_game_logs and keep rolling aggregates
+(last 5 / last 10 games, season-to-date) in player_rolling_stats.
+
+The game log CSV always holds each scraped player's full season, so most rows
+on a refresh are games we already have. Rows are staged in a TEMP table and
+diffed against player_game_logs; only new or corrected games are written, and
+for each player with a change we remember the earliest affected game date.
+
+player_rolling_stats stores running *sums* per (player_id, game_date), which
+makes the refresh incremental: for a changed player, rows from the earliest
+affected game onward are recomputed, seeded from the cumulative row just
+before the last-10 window. Everything earlier, and every unchanged player, is
+left alone. Averages and TS% are derived from the sums in the form view,
+which also compares recent form to player_season_stats.
+"""
+from pathlib import Path
+import sqlite3
+
+import pandas as pd
+
+from parse_sportsref_sunbelt_2024_25_gamelogs import OUT_CSV as GAMELOG_CSV, STAT_COLUMNS
+from player_name_matching import ALIAS_TABLE, ensure_alias_table
+from stage_metrics import StageMetrics, instrument_stage
+from warehouse_snapshots import connect_writable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+GAME_LOG_TABLE = "player_game_logs"
+ROLLING_TABLE = "player_rolling_stats"
+FORM_VIEW = "sun_belt_player_form_2024_25"
+STAGE_TABLE = "game_log_stage"
+DIRTY_TABLE = "game_log_dirty"
+
+# Stats carried through the rolling windows (as sums, plus a game count).
+ROLLING_STATS = ("mp", "pts", "trb", "ast", "stl", "blk", "tov", "fga", "fta", "fg3")
+WINDOWS = {"l5": 5, "l10": 10}
+# Prior games needed to fill the widest window at the first recomputed game.
+LOOKBACK = max(WINDOWS.values()) - 1
+
+ROW_COLUMNS = ("opp", "location", "result") + tuple(STAT_COLUMNS)
+
+
+def _rolling_columns() -> list[str]:
+    cols = ["g_std"] + [f"{s}_std" for s in ROLLING_STATS]
+    for w in WINDOWS:
+        cols += [f"g_{w}"] + [f"{s}_{w}" for s in ROLLING_STATS]
+    return cols
+
+
+ROLLING_COLUMNS = _rolling_columns()
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {GAME_LOG_TABLE} (
+    player_id INTEGER NOT NULL,
+    game_date TEXT    NOT NULL,   -- YYYY-MM-DD
+    team_id   INTEGER NOT NULL,
+    season    INTEGER NOT NULL,
+    opp       TEXT,
+    location  TEXT,               -- home / away / neutral
+    result    TEXT,
+    {", ".join(f"{c} REAL" for c in STAT_COLUMNS)},
+    PRIMARY KEY (player_id, game_date),
+    FOREIGN KEY (player_id) REFERENCES players(player_id),
+    FOREIGN KEY (team_id) REFERENCES teams(team_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_{GAME_LOG_TABLE}_team_date
+ON {GAME_LOG_TABLE} (team_id, game_date);
+
+CREATE TABLE IF NOT EXISTS {ROLLING_TABLE} (
+    player_id INTEGER NOT NULL,
+    game_date TEXT    NOT NULL,
+    {", ".join(f"{c} {'INTEGER' if c.startswith('g_') else 'REAL'}" for c in ROLLING_COLUMNS)},
+    PRIMARY KEY (player_id, game_date),
+    FOREIGN KEY (player_id) REFERENCES players(player_id)
+);
+"""
+
+
+def _per_game(col: str, games: str) -> str:
+    return f"ROUND(r.{col} * 1.0 / NULLIF(r.{games}, 0), 1)"
+
+
+def _ts_pct(w: str) -> str:
+    return (f"ROUND(r.pts_{w} / NULLIF(2.0 * (r.fga_{w} + 0.44 * r.fta_{w}), 0), 3)")
+
+
+FORM_VIEW_SQL = f"""
+CREATE VIEW IF NOT EXISTS {FORM_VIEW} AS
+SELECT
+    p.player_id,
+    p.full_name,
+    t.team_slug,
+    p.season,
+    r.game_date AS last_game,
+    r.g_std,
+    {_per_game("pts_std", "g_std")} AS pts_std,
+    {_per_game("pts_l5", "g_l5")}   AS pts_l5,
+    {_per_game("pts_l10", "g_l10")} AS pts_l10,
+    {_per_game("mp_l5", "g_l5")}    AS mp_l5,
+    {_per_game("trb_l5", "g_l5")}   AS trb_l5,
+    {_per_game("ast_l5", "g_l5")}   AS ast_l5,
+    {_ts_pct("std")} AS ts_pct_std,
+    {_ts_pct("l5")}  AS ts_pct_l5,
+    {_ts_pct("l10")} AS ts_pct_l10,
+    pss.pts    AS pts_season,
+    pss.ts_pct AS ts_pct_season,
+    ROUND(r.pts_l5 * 1.0 / NULLIF(r.g_l5, 0) - pss.pts, 1) AS pts_l5_vs_season
+FROM {ROLLING_TABLE} AS r
+JOIN players AS p ON p.player_id = r.player_id
+JOIN teams   AS t ON t.team_id   = p.team_id
+LEFT JOIN player_season_stats AS pss
+  ON pss.player_id = p.player_id
+ AND pss.season    = p.season
+WHERE r.game_date = (
+    SELECT MAX(game_date) FROM {ROLLING_TABLE} WHERE player_id = r.player_id
+);
+"""
+
+RESOLVE_TEAM_SQL = f"""
+UPDATE {STAGE_TABLE}
+SET team_id = t.team_id
+FROM teams AS t
+WHERE t.team_slug = {STAGE_TABLE}.team_slug;
+"""
+
+RESOLVE_EXACT_SQL = f"""
+UPDATE {STAGE_TABLE}
+SET player_id = p.player_id
+FROM players AS p
+WHERE p.team_id   = {STAGE_TABLE}.team_id
+  AND p.season    = {STAGE_TABLE}.season
+  AND p.full_name = {STAGE_TABLE}.player;
+"""
+
+# Names the roster step already resolved through the fuzzy matcher.
+RESOLVE_ALIAS_SQL = f"""
+UPDATE {STAGE_TABLE}
+SET player_id = a.player_id
+FROM {ALIAS_TABLE} AS a
+WHERE {STAGE_TABLE}.player_id IS NULL
+  AND a.alias_name = {STAGE_TABLE}.player
+  AND a.team_id    = {STAGE_TABLE}.team_id
+  AND a.season     = {STAGE_TABLE}.season;
+"""
+
+_CHANGED = " OR ".join(f"g.{c} IS NOT s.{c}" for c in ROW_COLUMNS)
+
+# Earliest new/changed game per player. Games that disappeared from a
+# player's (full-season) log count too.
+DIRTY_SQL = f"""
+INSERT INTO {DIRTY_TABLE} (player_id, since)
+SELECT player_id, MIN(game_date)
+FROM (
+    SELECT s.player_id, s.game_date
+    FROM {STAGE_TABLE} AS s
+    LEFT JOIN {GAME_LOG_TABLE} AS g
+      ON g.player_id = s.player_id
+     AND g.game_date = s.game_date
+    WHERE s.player_id IS NOT NULL
+      AND (g.player_id IS NULL OR {_CHANGED})
+    UNION ALL
+    SELECT g.player_id, g.game_date
+    FROM {GAME_LOG_TABLE} AS g
+    WHERE g.player_id IN (SELECT player_id FROM {STAGE_TABLE})
+      AND NOT EXISTS (
+          SELECT 1 FROM {STAGE_TABLE} AS s
+          WHERE s.player_id = g.player_id
+            AND s.game_date = g.game_date
+      )
+)
+GROUP BY player_id;
+"""
+
+DELETE_MISSING_SQL = f"""
+DELETE FROM {GAME_LOG_TABLE}
+WHERE player_id IN (SELECT player_id FROM {DIRTY_TABLE})
+  AND NOT EXISTS (
+      SELECT 1 FROM {STAGE_TABLE} AS s
+      WHERE s.player_id = {GAME_LOG_TABLE}.player_id
+        AND s.game_date = {GAME_LOG_TABLE}.game_date
+  );
+"""
+
+# Only new or corrected games; unchanged rows after a dirty date stay put.
+UPSERT_SQL = f"""
+INSERT OR REPLACE INTO {GAME_LOG_TABLE} (
+    player_id, game_date, team_id, season, {", ".join(ROW_COLUMNS)}
+)
+SELECT s.player_id, s.game_date, s.team_id, s.season, {", ".join(f"s.{c}" for c in ROW_COLUMNS)}
+FROM {STAGE_TABLE} AS s
+LEFT JOIN {GAME_LOG_TABLE} AS g
+  ON g.player_id = s.player_id
+ AND g.game_date = s.game_date
+WHERE s.player_id IS NOT NULL
+  AND (g.player_id IS NULL OR {_CHANGED});
+"""
+
+CLEAR_ROLLING_SQL = f"""
+DELETE FROM {ROLLING_TABLE}
+WHERE player_id IN (SELECT player_id FROM {DIRTY_TABLE})
+  AND game_date >= (
+      SELECT since FROM {DIRTY_TABLE} AS d
+      WHERE d.player_id = {ROLLING_TABLE}.player_id
+  );
+"""
+
+
+def _refresh_rolling_sql() -> str:
+    seeds = ",\n           ".join(
+        ["COALESCE(r.g_std, 0) AS g0"]
+        + [f"COALESCE(r.{s}_std, 0) AS {s}0" for s in ROLLING_STATS]
+    )
+    std = ["x.g0 + COUNT(*) OVER std"] + [
+        f"x.{s}0 + SUM(COALESCE(g.{s}, 0)) OVER std" for s in ROLLING_STATS]
+    windowed = list(std)
+    window_defs = ["std AS (PARTITION BY g.player_id ORDER BY g.game_date "
+                   "ROWS UNBOUNDED PRECEDING)"]
+    for w, n in WINDOWS.items():
+        windowed += ["COUNT(*) OVER " + w] + [
+            f"SUM(COALESCE(g.{s}, 0)) OVER {w}" for s in ROLLING_STATS]
+        window_defs.append(f"{w} AS (PARTITION BY g.player_id ORDER BY g.game_date "
+                           f"ROWS {n - 1} PRECEDING)")
+    select = ",\n        ".join(f"{expr} AS {col}"
+                                for expr, col in zip(windowed, ROLLING_COLUMNS))
+    return f"""
+WITH bounds AS MATERIALIZED (
+    -- latest game that stays untouched *and* is outside every window of
+    -- the first recomputed game; '' = recompute from the season opener
+    SELECT d.player_id, d.since,
+           COALESCE((
+               SELECT g.game_date FROM {GAME_LOG_TABLE} AS g
+               WHERE g.player_id = d.player_id AND g.game_date < d.since
+               ORDER BY g.game_date DESC
+               LIMIT 1 OFFSET {LOOKBACK}
+           ), '') AS seed_date
+    FROM {DIRTY_TABLE} AS d
+),
+seeded AS MATERIALIZED (
+    SELECT b.player_id, b.since, b.seed_date,
+           {seeds}
+    FROM bounds AS b
+    LEFT JOIN {ROLLING_TABLE} AS r
+      ON r.player_id = b.player_id
+     AND r.game_date = b.seed_date
+),
+windowed AS (
+    SELECT
+        g.player_id,
+        g.game_date,
+        x.since,
+        {select}
+    -- CROSS JOIN pins the loop order: dirty players outside, their games
+    -- inside, so untouched players' games are never read
+    FROM seeded AS x
+    CROSS JOIN {GAME_LOG_TABLE} AS g
+      ON g.player_id = x.player_id
+     AND g.game_date > x.seed_date
+    WINDOW {", ".join(window_defs)}
+)
+INSERT INTO {ROLLING_TABLE} (player_id, game_date, {", ".join(ROLLING_COLUMNS)})
+SELECT player_id, game_date, {", ".join(ROLLING_COLUMNS)}
+FROM windowed
+WHERE game_date >= since;
+"""
+
+
+REFRESH_ROLLING_SQL = _refresh_rolling_sql()
+
+UNMATCHED_SQL = f"""
+SELECT player, team_slug, COUNT(*) AS games
+FROM {STAGE_TABLE}
+WHERE player_id IS NULL
+GROUP BY player, team_slug
+ORDER BY team_slug, player;
+"""
+
+# Game logs vs the team page's season line: game counts should agree once
+# both are scraped after the same game.
+SEASON_CHECK_SQL = f"""
+SELECT p.full_name, t.team_slug, pss.g AS g_season, COUNT(gl.game_date) AS g_logs
+FROM player_season_stats AS pss
+JOIN players AS p ON p.player_id = pss.player_id
+JOIN teams   AS t ON t.team_id   = pss.team_id
+JOIN {GAME_LOG_TABLE} AS gl
+  ON gl.player_id = pss.player_id
+GROUP BY pss.player_id
+HAVING COUNT(gl.game_date) <> pss.g
+ORDER BY t.team_slug, p.full_name;
+"""
+
+
+def load_game_log_df() -> pd.DataFrame:
+    if not GAMELOG_CSV.exists():
+        raise FileNotFoundError(f"Game log CSV not found: {GAMELOG_CSV}")
+    return pd.read_csv(GAMELOG_CSV)
+
+
+def build_game_log_tables(conn: sqlite3.Connection) -> None:
+    """Create the fact table, rolling table and form view if missing."""
+    ensure_alias_table(conn)
+    with conn:
+        conn.executescript(SCHEMA_SQL)
+        conn.execute(FORM_VIEW_SQL)
+
+
+def stage_game_logs(conn: sqlite3.Connection, games_df: pd.DataFrame) -> int:
+    """Bulk-load game rows into a TEMP table keyed (team_slug, season, player, game_date)."""
+    conn.execute(f"DROP TABLE IF EXISTS temp.{STAGE_TABLE};")
+    conn.execute(
+        f"""
+        CREATE TEMP TABLE {STAGE_TABLE} (
+            team_slug TEXT    NOT NULL,
+            season    INTEGER NOT NULL,
+            player    TEXT    NOT NULL,
+            game_date TEXT    NOT NULL,
+            opp       TEXT,
+            location  TEXT,
+            result    TEXT,
+            {", ".join(f"{c} REAL" for c in STAT_COLUMNS)},
+            team_id   INTEGER,
+            player_id INTEGER,
+            PRIMARY KEY (team_slug, season, player, game_date)
+        );
+        """
+    )
+
+    cols = ["team_slug", "season", "player", "game_date"] + list(ROW_COLUMNS)
+    df = games_df[cols].astype(object).where(games_df[cols].notna(), None)
+    df["season"] = df["season"].astype(int)
+    conn.executemany(
+        f"""
+        INSERT OR REPLACE INTO {STAGE_TABLE} ({", ".join(cols)})
+        VALUES ({", ".join("?" for _ in cols)});
+        """,
+        df.itertuples(index=False, name=None),
+    )
+    return conn.execute(f"SELECT COUNT(*) FROM {STAGE_TABLE};").fetchone()[0]
+
+
+def explain_game_log_sql(conn: sqlite3.Connection, metrics: StageMetrics) -> None:
+    """Record query plans for the staged statements (stage + dirty must exist)."""
+    for label, sql in (
+        ("resolve_exact", RESOLVE_EXACT_SQL),
+        ("dirty_players", DIRTY_SQL),
+        ("upsert_games", UPSERT_SQL),
+        ("clear_rolling", CLEAR_ROLLING_SQL),
+        ("refresh_rolling", REFRESH_ROLLING_SQL),
+    ):
+        metrics.explain(conn, sql, label=label)
+
+
+def apply_game_logs(
+    conn: sqlite3.Connection,
+    games_df: pd.DataFrame,
+    metrics: StageMetrics | None = None,
+) -> tuple[int, int, list[tuple[str, str, int]]]:
+    """
+    Upsert game logs and incrementally refresh rolling aggregates.
+    Returns (games_written, players_refreshed, [(player, team_slug, games), ...] unmatched).
+    """
+    build_game_log_tables(conn)
+    with conn:
+        stage_game_logs(conn, games_df)
+        conn.execute(RESOLVE_TEAM_SQL)
+        conn.execute(RESOLVE_EXACT_SQL)
+        conn.execute(RESOLVE_ALIAS_SQL)
+        # indexed once player_ids are filled in, for the per-player diff below
+        conn.execute(
+            f"CREATE INDEX temp.idx_{STAGE_TABLE}_player "
+            f"ON {STAGE_TABLE} (player_id, game_date);"
+        )
+
+        conn.execute(f"DROP TABLE IF EXISTS temp.{DIRTY_TABLE};")
+        conn.execute(
+            f"CREATE TEMP TABLE {DIRTY_TABLE} "
+            "(player_id INTEGER PRIMARY KEY, since TEXT NOT NULL);"
+        )
+        if metrics is not None:
+            explain_game_log_sql(conn, metrics)
+
+        conn.execute(DIRTY_SQL)
+        conn.execute(DELETE_MISSING_SQL)
+        written = conn.execute(UPSERT_SQL).rowcount
+        conn.execute(CLEAR_ROLLING_SQL)
+        conn.execute(REFRESH_ROLLING_SQL)
+
+        refreshed = conn.execute(f"SELECT COUNT(*) FROM {DIRTY_TABLE};").fetchone()[0]
+        missing = conn.execute(UNMATCHED_SQL).fetchall()
+        conn.execute(f"DROP TABLE IF EXISTS temp.{STAGE_TABLE};")
+        conn.execute(f"DROP TABLE IF EXISTS temp.{DIRTY_TABLE};")
+    return written, refreshed, missing
+
+
+def main():
+    games_df = load_game_log_df()
+
+    conn = connect_writable(DB_PATH)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    try:
+        with instrument_stage("game_logs") as m:
+            m.rows_in = len(games_df)
+            written, refreshed, missing = apply_game_logs(conn, games_df, metrics=m)
+            m.rows_out = written
+            m.extra["players_refreshed"] = refreshed
+            m.extra["unmatched_players"] = len(missing)
+        mismatched = conn.execute(SEASON_CHECK_SQL).fetchall()
+    finally:
+        conn.close()
+
+    print(f"Wrote {written} new/changed games; refreshed rolling stats for {refreshed} players.")
+    if missing:
+        print(f"{len(missing)} game log players did not match any players row:")
+        for name, slug, games in missing[:10]:
+            print(f"  - {name} ({slug}, {games} games)")
+        if len(missing) > 10:
+            print("  ...")
+    if mismatched:
+        print(f"{len(mismatched)} players' game log counts differ from player_season_stats.g "
+              "(logs and team pages scraped after different games?):")
+        for name, slug, g_season, g_logs in mismatched[:10]:
+            print(f"  - {name} ({slug}): season g={g_season}, logs={g_logs}")
+
+
+if __name__ == "__main__":
+    main()
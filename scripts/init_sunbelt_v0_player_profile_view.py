@@ -1,6 +1,9 @@
 from pathlib import Path
 import sqlite3
 
+from stage_metrics import instrument_stage
+from warehouse_snapshots import connect_writable
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 
@@ -31,11 +34,17 @@ WHERE t.conference = 'Sun Belt'
 """
 
 
-def main() -> None:
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.executescript(DDL)
+def create_profile_view(conn: sqlite3.Connection) -> None:
+    conn.executescript(DDL)
     conn.commit()
+
+
+def main() -> None:
+    conn = connect_writable(DB_PATH)
+    with instrument_stage("profile_view") as m:
+        create_profile_view(conn)
+        m.rows_out = conn.execute(
+            "SELECT COUNT(*) FROM sun_belt_player_profile_2024_25;").fetchone()[0]
     conn.close()
     print(f"Created view sun_belt_player_profile_2024_25 on {DB_PATH}")
 
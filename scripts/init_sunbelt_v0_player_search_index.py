@@ -0,0 +1,281 @@
+"""
+FTS5 search index over players for type-ahead / misspelled name lookup.
+
+Two FTS5 tables, both keyed by rowid = players.player_id:
+
+* player_search: full_name, team_slug, season, class_year with the
+  unicode61 tokenizer (accent-insensitive) and prefix indexes, for ranked
+  type-ahead queries like "tar tod" -> "Taryn Todd".
+* player_search_trigram: full_name with the trigram tokenizer, the last
+  resort for misspellings in the first letters of a name ("Kaylen").
+
+Misspellings later in a name ("Jaylen Wilsn") are handled in between: names
+sharing each token's first two letters are pulled from player_search and
+re-ranked by string similarity.
+
+Every tier bounds its work so lookups stay in single-digit milliseconds at
+D1 scale: ranking only ever sees a capped set of candidates (newest players
+first), and the trigram tier ANDs the trigrams of each token *after* its
+first two letters, which a typo there leaves intact, instead of ORing every
+trigram and ranking most of the index.
+
+Triggers on players (and on teams.team_slug) keep both in sync, so the
+roster updater, schema seeding etc. never need to know the index exists.
+"""
+from difflib import SequenceMatcher
+from pathlib import Path
+import re
+import sqlite3
+import time
+import unicodedata
+
+from init_sun_belt_v0_schema import ensure_class_year_column
+from stage_metrics import instrument_stage
+from warehouse_snapshots import connect_writable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+SEARCH_TABLE = "player_search"
+TRIGRAM_TABLE = "player_search_trigram"
+
+# Column weights for bm25(): name matches matter most.
+NAME_WEIGHTS = "10.0, 2.0, 1.0, 1.0"
+
+# Caps on rows ranked per tier (newest players first). Short prefixes ("j")
+# or common first letters match a large share of the index otherwise.
+PREFIX_CANDIDATES = 500
+NEAR_CANDIDATES = 500
+TRIGRAM_CANDIDATES = 50
+NEAR_PREFIX = 2
+NEAR_MIN_SCORE = 0.75
+
+DDL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    full_name,
+    team_slug,
+    season,
+    class_year,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '1 2 3'
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_TABLE} USING fts5(
+    full_name,
+    tokenize = 'trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS players_search_ai AFTER INSERT ON players BEGIN
+    INSERT INTO {SEARCH_TABLE} (rowid, full_name, team_slug, season, class_year)
+    SELECT new.player_id, new.full_name, t.team_slug, new.season, new.class_year
+    FROM teams AS t
+    WHERE t.team_id = new.team_id;
+    INSERT INTO {TRIGRAM_TABLE} (rowid, full_name)
+    VALUES (new.player_id, new.full_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS players_search_ad AFTER DELETE ON players BEGIN
+    DELETE FROM {SEARCH_TABLE}  WHERE rowid = old.player_id;
+    DELETE FROM {TRIGRAM_TABLE} WHERE rowid = old.player_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS players_search_au
+AFTER UPDATE OF full_name, team_id, season, class_year ON players BEGIN
+    DELETE FROM {SEARCH_TABLE}  WHERE rowid = old.player_id;
+    DELETE FROM {TRIGRAM_TABLE} WHERE rowid = old.player_id;
+    INSERT INTO {SEARCH_TABLE} (rowid, full_name, team_slug, season, class_year)
+    SELECT new.player_id, new.full_name, t.team_slug, new.season, new.class_year
+    FROM teams AS t
+    WHERE t.team_id = new.team_id;
+    INSERT INTO {TRIGRAM_TABLE} (rowid, full_name)
+    VALUES (new.player_id, new.full_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS teams_search_au AFTER UPDATE OF team_slug ON teams BEGIN
+    UPDATE {SEARCH_TABLE}
+    SET team_slug = new.team_slug
+    WHERE rowid IN (SELECT player_id FROM players WHERE team_id = new.team_id);
+END;
+"""
+
+REBUILD_SQL = f"""
+DELETE FROM {SEARCH_TABLE};
+DELETE FROM {TRIGRAM_TABLE};
+
+INSERT INTO {SEARCH_TABLE} (rowid, full_name, team_slug, season, class_year)
+SELECT p.player_id, p.full_name, t.team_slug, p.season, p.class_year
+FROM players AS p
+JOIN teams AS t ON t.team_id = p.team_id;
+
+INSERT INTO {TRIGRAM_TABLE} (rowid, full_name)
+SELECT player_id, full_name FROM players;
+
+INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize');
+INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}) VALUES ('optimize');
+"""
+
+PREFIX_SEARCH_SQL = f"""
+SELECT player_id, full_name, team_slug, season, class_year
+FROM (
+    SELECT rowid AS player_id, full_name, team_slug, season, class_year,
+           bm25({SEARCH_TABLE}, {NAME_WEIGHTS}) AS score
+    FROM {SEARCH_TABLE}
+    WHERE {SEARCH_TABLE} MATCH ?
+    ORDER BY rowid DESC
+    LIMIT {PREFIX_CANDIDATES}
+)
+ORDER BY score
+LIMIT ?;
+"""
+
+NEAR_SEARCH_SQL = f"""
+SELECT rowid AS player_id, full_name, team_slug, season, class_year
+FROM {SEARCH_TABLE}
+WHERE {SEARCH_TABLE} MATCH ?
+ORDER BY rowid DESC
+LIMIT {NEAR_CANDIDATES};
+"""
+
+TRIGRAM_SEARCH_SQL = f"""
+SELECT s.rowid AS player_id, s.full_name, s.team_slug, s.season, s.class_year
+FROM {TRIGRAM_TABLE} AS g
+JOIN {SEARCH_TABLE}  AS s ON s.rowid = g.rowid
+WHERE {TRIGRAM_TABLE} MATCH :expr
+  AND (:season IS NULL OR s.season = :season)
+ORDER BY g.rowid DESC
+LIMIT {TRIGRAM_CANDIDATES};
+"""
+
+
+def build_search_index(conn: sqlite3.Connection) -> int:
+    """Create the FTS tables + sync triggers and (re)fill them from players."""
+    ensure_class_year_column(conn)
+    with conn:
+        conn.executescript(DDL)
+    with conn:
+        conn.executescript(REBUILD_SQL)
+    return conn.execute(f"SELECT COUNT(*) FROM {SEARCH_TABLE};").fetchone()[0]
+
+
+# -------------------------
+# Queries
+# -------------------------
+
+def _tokens(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def prefix_query(text: str, season: int | None = None) -> str:
+    """'tar tod' -> '"tar"* "tod"*' (every token must prefix-match a column)."""
+    expr = " ".join(f'"{tok}"*' for tok in _tokens(text))
+    if expr and season is not None:
+        expr += f' AND season : "{int(season)}"'
+    return expr
+
+
+def near_query(text: str) -> str:
+    """'jaylen wilsn' -> 'full_name : ("ja"* "wi"*)'."""
+    toks = _tokens(text)
+    if not toks:
+        return ""
+    return "full_name : (" + " ".join(f'"{tok[:NEAR_PREFIX]}"*' for tok in toks) + ")"
+
+
+def trigram_query(text: str) -> str:
+    """
+    'kaylen wilson' -> '"yle" "len" "lso" "son"': every trigram of each token
+    after its first NEAR_PREFIX letters (the part the near tier relies on
+    being typo-free). Empty when the tokens are too short to have any.
+    """
+    grams = []
+    for tok in _tokens(text):
+        tail = tok[NEAR_PREFIX:]
+        grams.extend(tail[i:i + 3] for i in range(len(tail) - 2))
+    return " ".join(f'"{g}"' for g in dict.fromkeys(grams))
+
+
+def _by_similarity(rows, text: str, min_score: float = 0.0) -> list[tuple]:
+    """Rows whose name is close to `text`, best name first, newest season first."""
+    # the target is seq2, so its match index is built once for all candidates
+    matcher = SequenceMatcher(None, "", " ".join(_tokens(text)))
+    scores = {}
+    kept = []
+    for row in rows:
+        name = row[1]
+        if name not in scores:
+            matcher.set_seq1(" ".join(_tokens(name)))
+            # cheap upper bounds first; ratio() is the expensive part
+            if matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score:
+                scores[name] = 0.0
+            else:
+                scores[name] = matcher.ratio()
+        if scores[name] >= min_score:
+            kept.append(row)
+    kept.sort(key=lambda r: (-scores[r[1]], -int(r[3])))
+    return kept
+
+
+def _near_rows(conn: sqlite3.Connection, text: str) -> list[tuple]:
+    rows = conn.execute(NEAR_SEARCH_SQL, (near_query(text),))
+    return _by_similarity(rows, text, NEAR_MIN_SCORE)
+
+
+def search_players(
+    conn: sqlite3.Connection, text: str, limit: int = 10, season: int | None = None
+) -> list[dict]:
+    """
+    Ranked player search, in tiers until `limit` is filled:
+
+    1. prefix: every token prefix-matches name/team/season/class (bm25
+               order among the newest PREFIX_CANDIDATES matches)
+    2. near:   names sharing each token's first letters, by similarity
+    3. fuzzy:  names containing the rest of every token, by similarity;
+               only when nothing closer matched (typos in the first letters)
+    """
+    cols = ("player_id", "full_name", "team_slug", "season", "class_year")
+    results, seen = [], set()
+
+    def add(rows, match):
+        for row in rows:
+            if len(results) >= limit:
+                return
+            if row[0] in seen or (season is not None and int(row[3]) != season):
+                continue
+            results.append(dict(zip(cols, row), match=match))
+            seen.add(row[0])
+
+    expr = prefix_query(text, season)
+    if not expr:
+        return results
+    add(conn.execute(PREFIX_SEARCH_SQL, (expr, limit)), "prefix")
+
+    if len(results) < limit:
+        add(_near_rows(conn, text), "near")
+
+    expr = trigram_query(text)
+    if not results and expr:
+        rows = conn.execute(TRIGRAM_SEARCH_SQL, {"expr": expr, "season": season})
+        add(_by_similarity(rows, text), "fuzzy")
+    return results
+
+
+def main() -> None:
+    conn = connect_writable(DB_PATH)
+    with instrument_stage("search_index") as m:
+        m.rows_out = build_search_index(conn)
+    print(f"Indexed {m.rows_out} players in {SEARCH_TABLE} / {TRIGRAM_TABLE}")
+
+    sample = conn.execute("SELECT full_name FROM players LIMIT 1;").fetchone()
+    if sample:
+        for text in (sample[0][:5], sample[0][:-2] + "xx"):
+            start = time.perf_counter()
+            hits = search_players(conn, text)
+            ms = (time.perf_counter() - start) * 1000
+            print(f"  search {text!r}: {len(hits)} hits in {ms:.2f} ms")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
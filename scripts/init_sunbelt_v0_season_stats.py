@@ -1,15 +1,64 @@
 from pathlib import Path
 import sqlite3
 
+from stage_metrics import StageMetrics, instrument_stage
+from warehouse_snapshots import connect_writable
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 
 STATS_TABLE = "player_per_game_sun_belt_2024_25"
 
-
-def main():
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
+POPULATE_SQL = f"""
+INSERT OR REPLACE INTO player_season_stats (
+    player_id, team_id, season,
+    pos, g, gs, mp,
+    fg, fga, fg_pct,
+    fg3, fg3a, fg3_pct,
+    fg2, fg2a, fg2_pct,
+    efg_pct,
+    ft, fta, ft_pct,
+    orb, drb, trb,
+    ast, stl, blk,
+    tov, pf, pts,
+    ts_pct,
+    awards
+)
+SELECT
+    p.player_id,
+    t.team_id,
+    s.season,
+
+    s.pos,
+    s.g, s.gs, s.mp,
+    s.fg, s.fga, s.fg_pct,
+    s.fg3, s.fg3a, s.fg3_pct,
+    s.fg2, s.fg2a, s.fg2_pct,
+    s.efg_pct,
+    s.ft, s.fta, s.ft_pct,
+    s.orb, s.drb, s.trb,
+    s.ast, s.stl, s.blk,
+    s.tov, s.pf, s.pts,
+    CASE
+        WHEN (s.fga + 0.44 * s.fta) > 0
+        THEN s.pts / (2.0 * (s.fga + 0.44 * s.fta))
+        ELSE NULL
+    END AS ts_pct,
+    s.awards
+FROM {STATS_TABLE} AS s
+JOIN teams   AS t ON t.team_slug = s.team_slug
+JOIN players AS p
+  ON p.full_name = s.player
+ AND p.team_id   = t.team_id
+ AND p.season    = s.season;
+"""
+
+
+def build_season_stats(conn: sqlite3.Connection, metrics: StageMetrics | None = None) -> None:
+    """
+    Create + populate player_season_stats and the Sun Belt season view.
+    With `metrics`, the populate join's query plan is recorded.
+    """
     cur = conn.cursor()
 
     # ----------------------------------
@@ -67,51 +116,9 @@ def main():
     # 2. Populate from per-game table
     # ----------------------------------
     # Note: TS% = PTS / (2 * (FGA + 0.44 * FTA)) if denominator > 0
-    cur.execute(
-        f"""
-        INSERT OR REPLACE INTO player_season_stats (
-            player_id, team_id, season,
-            pos, g, gs, mp,
-            fg, fga, fg_pct,
-            fg3, fg3a, fg3_pct,
-            fg2, fg2a, fg2_pct,
-            efg_pct,
-            ft, fta, ft_pct,
-            orb, drb, trb,
-            ast, stl, blk,
-            tov, pf, pts,
-            ts_pct,
-            awards
-        )
-        SELECT
-            p.player_id,
-            t.team_id,
-            s.season,
-
-            s.pos,
-            s.g, s.gs, s.mp,
-            s.fg, s.fga, s.fg_pct,
-            s.fg3, s.fg3a, s.fg3_pct,
-            s.fg2, s.fg2a, s.fg2_pct,
-            s.efg_pct,
-            s.ft, s.fta, s.ft_pct,
-            s.orb, s.drb, s.trb,
-            s.ast, s.stl, s.blk,
-            s.tov, s.pf, s.pts,
-            CASE
-                WHEN (s.fga + 0.44 * s.fta) > 0
-                THEN s.pts / (2.0 * (s.fga + 0.44 * s.fta))
-                ELSE NULL
-            END AS ts_pct,
-            s.awards
-        FROM {STATS_TABLE} AS s
-        JOIN teams   AS t ON t.team_slug = s.team_slug
-        JOIN players AS p
-          ON p.full_name = s.player
-         AND p.team_id   = t.team_id
-         AND p.season    = s.season;
-        """
-    )
+    if metrics is not None:
+        metrics.explain(conn, POPULATE_SQL, label="populate_player_season_stats")
+    cur.execute(POPULATE_SQL)
 
     # ----------------------------------
     # 3. Convenience view for Sun Belt 24–25
@@ -133,6 +140,18 @@ def main():
 
     conn.commit()
 
+
+def main():
+    conn = connect_writable(DB_PATH)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    cur = conn.cursor()
+    with instrument_stage("season_stats") as m:
+        cur.execute(f"SELECT COUNT(*) FROM {STATS_TABLE};")
+        m.rows_in = cur.fetchone()[0]
+        build_season_stats(conn, metrics=m)
+        cur.execute("SELECT COUNT(*) FROM player_season_stats;")
+        m.rows_out = cur.fetchone()[0]
+
     # Sanity prints
     cur.execute("SELECT COUNT(*) FROM player_season_stats WHERE season = 2025;")
     print("player_season_stats rows (2025):", cur.fetchone()[0])
@@ -0,0 +1,266 @@
+"""
+Build team_season_stats: one row per (team, season) with season totals,
+possessions, pace and shooting rates, plus a view of per-player shares of
+their team's minutes, points, rebounds, assists and possessions used.
+
+Team totals are computed in one vectorized groupby over the per-game fact
+table: each player's per-game line times their games played, summed per team.
+The team's games is the most any player appeared in. Sports-Reference's own
+"Team Totals" row (kept by the parser in team_totals_sun_belt_2024_25) is used
+as a cross-check. The two should agree to within the rounding of the per-game
+lines (0.05 per player-game).
+
+Refreshes are incremental. Each team's source rows are fingerprinted (an
+order-independent sum of row hashes, prefixed with FORMULA_VERSION, stored as
+source_hash), and only teams whose fingerprint changed are rewritten. Bumping
+FORMULA_VERSION therefore rewrites every team. Teams that disappeared from the
+source are deleted.
+
+Possessions use the box-score estimate FGA - ORB + TOV + 0.475 * FTA (no
+opponent data is scraped). Pace is possessions per 40 minutes.
+"""
+from pathlib import Path
+import sqlite3
+
+import pandas as pd
+
+from stage_metrics import StageMetrics, instrument_stage
+from warehouse_snapshots import connect_writable
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+STATS_TABLE = "player_per_game_sun_belt_2024_25"
+TEAM_TOTALS_TABLE = "team_totals_sun_belt_2024_25"
+TEAM_STATS_TABLE = "team_season_stats"
+SHARE_VIEW = "sun_belt_player_team_share_2024_25"
+
+KEYS = ["team_id", "season"]
+# Per-game columns that sum to team totals (per-game value x games played)
+COUNT_STATS = [
+    "mp", "fg", "fga", "fg3", "fg3a", "fg2", "fg2a", "ft", "fta",
+    "orb", "drb", "trb", "ast", "stl", "blk", "tov", "pf", "pts",
+]
+# Source columns fingerprinted per team to detect changes
+HASH_COLUMNS = ["player", "g", "gs"] + COUNT_STATS
+FTA_POSS = 0.475
+# Part of source_hash: bump whenever a derived column or constant above changes
+FORMULA_VERSION = 1
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {TEAM_STATS_TABLE} (
+    team_id INTEGER NOT NULL,
+    season  INTEGER NOT NULL,
+
+    g            INTEGER,   -- team games (most games by any player)
+    player_games INTEGER,   -- sum of players' games
+
+    {", ".join(f"{c} REAL" for c in COUNT_STATS)},
+
+    poss    REAL,           -- season possessions (box-score estimate)
+    pace    REAL,           -- possessions per 40 minutes
+    off_rtg REAL,           -- points per 100 possessions
+    fg_pct  REAL,
+    fg3_pct REAL,
+    ft_pct  REAL,
+    efg_pct REAL,
+    ts_pct  REAL,
+
+    source_hash TEXT NOT NULL,
+
+    PRIMARY KEY (team_id, season),
+    FOREIGN KEY (team_id) REFERENCES teams(team_id)
+);
+"""
+
+# Season totals are player per-game x g, so shares are plain ratios of totals.
+SHARE_VIEW_SQL = f"""
+CREATE VIEW IF NOT EXISTS {SHARE_VIEW} AS
+SELECT
+    s.player_id,
+    p.full_name,
+    t.team_slug,
+    s.season,
+    s.g,
+    s.mp,
+    ts.g AS team_g,
+    ts.pace AS team_pace,
+    5.0 * s.g * s.mp / NULLIF(ts.mp, 0)   AS min_pct,
+    s.g * s.pts / NULLIF(ts.pts, 0)       AS pts_share,
+    s.g * s.trb / NULLIF(ts.trb, 0)       AS trb_share,
+    s.g * s.ast / NULLIF(ts.ast, 0)       AS ast_share,
+    s.g * s.fga / NULLIF(ts.fga, 0)       AS fga_share,
+    -- usage: share of team possessions used while on the floor
+    (s.fga + 0.44 * s.fta + s.tov) * ts.mp
+        / NULLIF(5.0 * s.mp * (ts.fga + 0.44 * ts.fta + ts.tov), 0) AS usg_pct
+FROM player_season_stats AS s
+JOIN players AS p ON p.player_id = s.player_id
+JOIN teams   AS t ON t.team_id   = s.team_id
+JOIN {TEAM_STATS_TABLE} AS ts
+  ON ts.team_id = s.team_id
+ AND ts.season  = s.season
+WHERE t.conference = 'Sun Belt'
+  AND s.season     = 2025;
+"""
+
+SOURCE_SQL = f"""
+SELECT t.team_id, s.team_slug, s.season, s.player, s.g, s.gs,
+       {", ".join(f"s.{c}" for c in COUNT_STATS)}
+FROM {STATS_TABLE} AS s
+JOIN teams AS t ON t.team_slug = s.team_slug;
+"""
+
+COLUMNS = KEYS + ["g", "player_games"] + COUNT_STATS + [
+    "poss", "pace", "off_rtg", "fg_pct", "fg3_pct", "ft_pct", "efg_pct", "ts_pct",
+    "source_hash",
+]
+
+UPSERT_SQL = f"""
+INSERT OR REPLACE INTO {TEAM_STATS_TABLE} ({", ".join(COLUMNS)})
+VALUES ({", ".join("?" for _ in COLUMNS)});
+"""
+
+
+def build_team_stats_tables(conn: sqlite3.Connection) -> None:
+    with conn:
+        conn.executescript(SCHEMA_SQL)
+        conn.execute(SHARE_VIEW_SQL)
+
+
+def load_source(conn: sqlite3.Connection) -> pd.DataFrame:
+    return pd.read_sql_query(SOURCE_SQL, conn)
+
+
+def _ratio(num: pd.Series, den: pd.Series) -> pd.Series:
+    return num / den.where(den > 0)
+
+
+def compute_team_stats(source: pd.DataFrame) -> pd.DataFrame:
+    """Team-season totals + rates from per-game player rows, one row per (team_id, season)."""
+    g = source["g"].fillna(0)
+    work = source[KEYS].copy()
+    work["g"] = g
+    work[COUNT_STATS] = source[COUNT_STATS].fillna(0).mul(g, axis=0)
+    work["row_hash"] = pd.util.hash_pandas_object(source[HASH_COLUMNS], index=False)
+
+    # One pass: uint64 hash sums wrap, which keeps them order-independent.
+    teams = work.groupby(KEYS).agg(
+        g=("g", "max"),
+        player_games=("g", "sum"),
+        row_hash=("row_hash", "sum"),
+        **{c: (c, "sum") for c in COUNT_STATS},
+    ).reset_index()
+
+    teams["poss"] = teams["fga"] - teams["orb"] + teams["tov"] + FTA_POSS * teams["fta"]
+    # team minutes / 5 = minutes of game played
+    teams["pace"] = _ratio(40.0 * teams["poss"], teams["mp"] / 5.0)
+    teams["off_rtg"] = _ratio(100.0 * teams["pts"], teams["poss"])
+    teams["fg_pct"] = _ratio(teams["fg"], teams["fga"])
+    teams["fg3_pct"] = _ratio(teams["fg3"], teams["fg3a"])
+    teams["ft_pct"] = _ratio(teams["ft"], teams["fta"])
+    teams["efg_pct"] = _ratio(teams["fg"] + 0.5 * teams["fg3"], teams["fga"])
+    teams["ts_pct"] = _ratio(teams["pts"], 2.0 * (teams["fga"] + 0.44 * teams["fta"]))
+    teams["source_hash"] = teams["row_hash"].map(f"v{FORMULA_VERSION}-{{:016x}}".format)
+    return teams.drop(columns="row_hash")
+
+
+def write_team_stats(
+    conn: sqlite3.Connection, teams: pd.DataFrame
+) -> tuple[int, int]:
+    """Rewrite only teams whose source_hash changed; drop vanished teams. Returns (written, deleted)."""
+    stored = {
+        (team_id, season): source_hash
+        for team_id, season, source_hash in conn.execute(
+            f"SELECT team_id, season, source_hash FROM {TEAM_STATS_TABLE};")
+    }
+    keys = list(zip(teams["team_id"], teams["season"]))
+    changed = teams[[stored.get(k) != h for k, h in zip(keys, teams["source_hash"])]]
+    gone = set(stored) - set(keys)
+
+    rows = changed[COLUMNS].astype(object).where(changed[COLUMNS].notna(), None)
+    with conn:
+        conn.executemany(UPSERT_SQL, rows.itertuples(index=False, name=None))
+        conn.executemany(
+            f"DELETE FROM {TEAM_STATS_TABLE} WHERE team_id = ? AND season = ?;",
+            sorted(gone),
+        )
+    return len(changed), len(gone)
+
+
+def check_team_totals(
+    conn: sqlite3.Connection, source: pd.DataFrame, teams: pd.DataFrame
+) -> list[tuple[str, int, str, float, float]]:
+    """
+    Compare computed per-game team lines with the pages' Team Totals rows.
+    Returns [(team_slug, season, stat, computed, reported), ...] outside the
+    rounding tolerance; empty when no Team Totals table was loaded.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;",
+        (TEAM_TOTALS_TABLE,),
+    ).fetchone()
+    if not exists:
+        return []
+    reported = pd.read_sql_query(
+        f"SELECT team_slug, season, g, {', '.join(COUNT_STATS)} FROM {TEAM_TOTALS_TABLE};",
+        conn,
+    )
+    slugs = source[KEYS + ["team_slug"]].drop_duplicates(KEYS)
+    both = teams.merge(slugs, on=KEYS).merge(
+        reported, on=["team_slug", "season"], suffixes=("", "_reported"))
+
+    # each per-game line is rounded to 0.1, and so is the Team Totals row
+    tolerance = 0.05 * both["player_games"] / both["g"] + 0.05
+    mismatches = []
+    for stat in ["g"] + COUNT_STATS:
+        computed = both[stat] if stat == "g" else both[stat] / both["g"]
+        off = (computed - both[f"{stat}_reported"]).abs() > (0 if stat == "g" else tolerance)
+        for row, value in zip(both[off].itertuples(index=False), computed[off]):
+            mismatches.append(
+                (row.team_slug, row.season, stat, float(value),
+                 float(getattr(row, f"{stat}_reported"))))
+    return mismatches
+
+
+def refresh_team_stats(
+    conn: sqlite3.Connection, metrics: StageMetrics | None = None
+) -> tuple[int, int, list[tuple[str, int, str, float, float]]]:
+    """
+    Recompute team aggregates and write the changed teams.
+    Returns (teams_written, teams_deleted, Team Totals mismatches).
+    """
+    build_team_stats_tables(conn)
+    source = load_source(conn)
+    teams = compute_team_stats(source)
+    written, deleted = write_team_stats(conn, teams)
+    mismatches = check_team_totals(conn, source, teams)
+    if metrics is not None:
+        metrics.rows_in = len(source)
+        metrics.rows_out = written
+        metrics.extra["teams"] = len(teams)
+        metrics.extra["totals_mismatches"] = len(mismatches)
+    return written, deleted, mismatches
+
+
+def main():
+    conn = connect_writable(DB_PATH)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    try:
+        with instrument_stage("team_stats") as m:
+            written, deleted, mismatches = refresh_team_stats(conn, metrics=m)
+        n_teams = conn.execute(f"SELECT COUNT(*) FROM {TEAM_STATS_TABLE};").fetchone()[0]
+    finally:
+        conn.close()
+
+    print(f"team_season_stats: {n_teams} teams ({written} rewritten, {deleted} deleted).")
+    if mismatches:
+        print(f"{len(mismatches)} team stats differ from the page's Team Totals row:")
+        for slug, season, stat, computed, reported in mismatches[:10]:
+            print(f"  - {slug} {season} {stat}: computed {computed:.2f}, "
+                  f"Team Totals {reported:.2f}")
+        if len(mismatches) > 10:
+            print("  ...")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ import sqlite3
 
 import pandas as pd
 
+from stage_metrics import instrument_stage
+from warehouse_snapshots import connect_writable
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 CSV_PATH = (
@@ -14,13 +17,25 @@ CSV_PATH = (
     / "sun_belt_2024_25_per_game_all_teams.csv"
 )
 
+TEAM_TOTALS_CSV_PATH = CSV_PATH.with_name("sun_belt_2024_25_team_totals.csv")
+
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 TABLE_NAME = "player_per_game_sun_belt_2024_25"
+# Each team page's "Team Totals" per-game row (cross-check for team_season_stats)
+TEAM_TOTALS_TABLE = "team_totals_sun_belt_2024_25"
 
 
 def load_csv() -> pd.DataFrame:
-    df = pd.read_csv(CSV_PATH)
+    return normalize_columns(pd.read_csv(CSV_PATH))
+
 
+def load_team_totals_csv() -> pd.DataFrame | None:
+    if not TEAM_TOTALS_CSV_PATH.exists():
+        return None
+    return normalize_columns(pd.read_csv(TEAM_TOTALS_CSV_PATH))
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     # Normalize column names for SQL (no %, spaces, etc.)
     rename_map = {
         "Rk": "rk",
@@ -66,36 +81,50 @@ def load_csv() -> pd.DataFrame:
     return df
 
 
-def write_to_sqlite(df: pd.DataFrame) -> None:
+def write_table(conn: sqlite3.Connection, df: pd.DataFrame) -> None:
+    # Replace table each time for now
+    df.to_sql(TABLE_NAME, conn, if_exists="replace", index=False)
+
+    # Simple index to speed up lookups
+    with conn:
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_team_season "
+            f"ON {TABLE_NAME} (team_slug, season)"
+        )
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_player "
+            f"ON {TABLE_NAME} (player)"
+        )
+
+
+def write_team_totals(conn: sqlite3.Connection, totals_df: pd.DataFrame) -> None:
+    totals_df.to_sql(TEAM_TOTALS_TABLE, conn, if_exists="replace", index=False)
+    conn.commit()
+
+
+def write_to_sqlite(df: pd.DataFrame, totals_df: pd.DataFrame | None = None) -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_writable(DB_PATH)
     try:
-        # Replace table each time for now
-        df.to_sql(TABLE_NAME, conn, if_exists="replace", index=False)
-
-        # Simple index to speed up lookups
-        with conn:
-            conn.execute(
-                f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_team_season "
-                f"ON {TABLE_NAME} (team_slug, season)"
-            )
-            conn.execute(
-                f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_player "
-                f"ON {TABLE_NAME} (player)"
-            )
-
+        write_table(conn, df)
+        if totals_df is not None:
+            write_team_totals(conn, totals_df)
     finally:
         conn.close()
 
 
 def main():
-    print(f"Loading CSV from: {CSV_PATH}")
-    df = load_csv()
-    print(f"Loaded {len(df)} rows")
-
-    print(f"Writing to SQLite DB: {DB_PATH} (table={TABLE_NAME})")
-    write_to_sqlite(df)
+    with instrument_stage("load") as m:
+        print(f"Loading CSV from: {CSV_PATH}")
+        df = load_csv()
+        m.rows_in = len(df)
+        print(f"Loaded {len(df)} rows")
+        totals_df = load_team_totals_csv()
+
+        print(f"Writing to SQLite DB: {DB_PATH} (table={TABLE_NAME})")
+        write_to_sqlite(df, totals_df)
+        m.rows_out = len(df)
     print("Done.")
 
 
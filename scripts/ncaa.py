@@ -0,0 +1,365 @@
+"""
+ncaa: one entry point for every pipeline script and quick warehouse queries.
+
+    python scripts/ncaa.py <command> [args...]
+    python scripts/ncaa.py --help
+
+Only the standard library is imported at startup. Each subcommand imports its
+backing module when it runs, so SQLite-only commands (queries, the profile
+view, snapshots) never pay for pandas / NumPy / BeautifulSoup. Run
+`ncaa import-report` to check that stays true.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+HEAVY_MODULES = ("pandas", "numpy", "bs4", "requests")
+
+# Light commands must import in under this many ms (on top of interpreter startup).
+LIGHT_IMPORT_BUDGET_MS = 100.0
+
+
+@dataclass(frozen=True)
+class Command:
+    module: str
+    func: str
+    help: str
+    light: bool = False
+    # whether `func` parses sys.argv itself (otherwise extra args are an error)
+    takes_args: bool = False
+
+
+COMMANDS = {
+    # pipeline steps
+    "scrape": Command("scrape_sunbelt_2024_25", "main",
+                      "STEP 1: download raw HTML for all Sun Belt teams"),
+    "parse": Command("parse_sportsref_sunbelt_2024_25", "main",
+                     "STEP 2: HTML -> per-game CSVs + combined CSV"),
+    "load": Command("load_sunbelt_2024_25_sqlite", "main",
+                    "STEP 3: load combined CSV into the SQLite fact table"),
+    "schema": Command("init_sun_belt_v0_schema", "main",
+                      "STEP 4: create + seed teams and players", light=True),
+    "season-stats": Command("init_sunbelt_v0_season_stats", "main",
+                            "STEP 5: build player_season_stats + TS%", light=True),
+    "team-stats": Command("init_sunbelt_v0_team_season_stats", "main",
+                          "STEP 5b: build team_season_stats + share view"),
+    "similarity": Command("compute_sunbelt_2024_25_similarity", "main",
+                          "STEP 6: build the player similarity table"),
+    "parse-rosters": Command("parse_sportsref_sunbelt_2024_25_rosters", "main",
+                             "STEP 7a: parse roster tables"),
+    "roster-update": Command("update_players_from_sunbelt_rosters_2024_25", "main",
+                             "STEP 7b: enrich players from the roster CSV"),
+    "profile-view": Command("init_sunbelt_v0_player_profile_view", "main",
+                            "STEP 7c: create the player profile view", light=True),
+    "search-index": Command("init_sunbelt_v0_player_search_index", "main",
+                            "STEP 7d: build the player name search index", light=True),
+    "scrape-gamelogs": Command("scrape_sunbelt_2024_25_gamelogs", "main",
+                               "STEP 8a: download player game log pages", takes_args=True),
+    "parse-gamelogs": Command("parse_sportsref_sunbelt_2024_25_gamelogs", "main",
+                              "STEP 8b: parse game logs (changed pages only)"),
+    "game-logs": Command("init_sunbelt_v0_game_logs", "main",
+                         "STEP 8c: upsert game logs + refresh rolling stats"),
+    "export": Command("warehouse_export", "main",
+                      "STEP 9: export profiles + comps as partitioned files",
+                      light=True, takes_args=True),
+    # orchestration + tooling
+    "pipeline": Command("run_sunbelt_2024_25_pipeline", "main",
+                        "run the whole pipeline (see --help)", light=True, takes_args=True),
+    "snapshots": Command("warehouse_snapshots", "main",
+                         "list / roll back published snapshots", light=True, takes_args=True),
+    "serve": Command("serve_read_api", "main",
+                     "serve the read-only JSON API", light=True, takes_args=True),
+    "generate": Command("generate_synthetic_sportsref", "main",
+                        "write synthetic team pages", light=True, takes_args=True),
+    "bench": Command("benchmark_pipeline", "main",
+                     "benchmark every stage on synthetic data", takes_args=True),
+    # quick queries (SQLite only)
+    "player": Command("ncaa", "player_command",
+                      "show profiles matching a name", light=True, takes_args=True),
+    "search": Command("ncaa", "search_command",
+                      "type-ahead / fuzzy player name search", light=True, takes_args=True),
+    "comps": Command("ncaa", "comps_command",
+                     "show top comps for a player id", light=True, takes_args=True),
+    "top": Command("ncaa", "top_command",
+                   "top players by a stat", light=True, takes_args=True),
+    "form": Command("ncaa", "form_command",
+                    "hottest players: last-5 scoring vs season", light=True, takes_args=True),
+    "import-report": Command("ncaa", "import_report_command",
+                             "time each subcommand's imports", light=True, takes_args=True),
+}
+
+
+# -------------------------
+# Quick queries
+# -------------------------
+
+PROFILE_VIEW = "sun_belt_player_profile_2024_25"
+SIM_TABLE = "player_similarity_sun_belt_2024_25"
+FORM_VIEW = "sun_belt_player_form_2024_25"
+TOP_STATS = ("pts", "ts_pct", "mp", "g", "height_cm", "weight_kg")
+
+
+def connect_ro():
+    import sqlite3
+
+    if not DB_PATH.exists():
+        sys.exit(f"Warehouse DB not found: {DB_PATH}")
+    return sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+
+
+def print_rows(cur) -> None:
+    print_table([d[0] for d in cur.description], cur.fetchall())
+
+
+def print_table(cols, rows) -> None:
+    widths = [
+        max(len(c), *(len(_fmt(r[i])) for r in rows)) if rows else len(c)
+        for i, c in enumerate(cols)
+    ]
+    print("  ".join(c.ljust(w) for c, w in zip(cols, widths)))
+    for r in rows:
+        print("  ".join(_fmt(v).ljust(w) for v, w in zip(r, widths)))
+    if not rows:
+        print("(no rows)")
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return "" if value is None else str(value)
+
+
+def player_command(argv: list[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ncaa player")
+    parser.add_argument("name", help="full or partial player name")
+    args = parser.parse_args(argv)
+
+    conn = connect_ro()
+    cur = conn.execute(
+        f"""
+        SELECT player_id, full_name, team_slug, season, class_year,
+               height_cm, weight_kg, g, mp, pts, ts_pct
+        FROM {PROFILE_VIEW}
+        WHERE full_name LIKE ?
+        ORDER BY pts DESC
+        LIMIT 25;
+        """,
+        (f"%{args.name}%",),
+    )
+    print_rows(cur)
+    conn.close()
+
+
+def search_command(argv: list[str]) -> None:
+    import argparse
+    import time
+
+    from init_sunbelt_v0_player_search_index import search_players
+
+    parser = argparse.ArgumentParser(prog="ncaa search")
+    parser.add_argument("text", nargs="+", help="name prefix or misspelled name")
+    parser.add_argument("--season", type=int)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    conn = connect_ro()
+    start = time.perf_counter()
+    hits = search_players(conn, " ".join(args.text), args.limit, args.season)
+    ms = (time.perf_counter() - start) * 1000
+    conn.close()
+
+    cols = ("player_id", "full_name", "team_slug", "season", "class_year", "match")
+    print_table(cols, [[h[c] for c in cols] for h in hits])
+    print(f"({len(hits)} hits in {ms:.2f} ms)")
+
+
+def comps_command(argv: list[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ncaa comps")
+    parser.add_argument("player_id", type=int)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    conn = connect_ro()
+    cur = conn.execute(
+        f"""
+        SELECT s.rank, cp.full_name AS comp_player, ct.team_slug AS comp_team,
+               s.distance
+        FROM {SIM_TABLE} AS s
+        JOIN players AS cp ON cp.player_id = s.comp_player_id
+        JOIN teams   AS ct ON ct.team_id   = cp.team_id
+        WHERE s.player_id = ?
+        ORDER BY s.rank
+        LIMIT ?;
+        """,
+        (args.player_id, args.k),
+    )
+    print_rows(cur)
+    conn.close()
+
+
+def top_command(argv: list[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ncaa top")
+    parser.add_argument("--by", choices=TOP_STATS, default="pts")
+    parser.add_argument("--team", help="restrict to one team slug")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    where, params = "", []
+    if args.team:
+        where, params = "WHERE team_slug = ?", [args.team]
+    conn = connect_ro()
+    cur = conn.execute(
+        f"""
+        SELECT full_name, team_slug, class_year, height_cm, {args.by}
+        FROM {PROFILE_VIEW}
+        {where}
+        ORDER BY {args.by} DESC
+        LIMIT ?;
+        """,
+        params + [args.limit],
+    )
+    print_rows(cur)
+    conn.close()
+
+
+def form_command(argv: list[str]) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="ncaa form")
+    parser.add_argument("--team", help="restrict to one team slug")
+    parser.add_argument("--min-games", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    where, params = "WHERE g_std >= ?", [args.min_games]
+    if args.team:
+        where += " AND team_slug = ?"
+        params.append(args.team)
+    conn = connect_ro()
+    cur = conn.execute(
+        f"""
+        SELECT full_name, team_slug, last_game, g_std,
+               pts_season, pts_std, pts_l10, pts_l5, pts_l5_vs_season, ts_pct_l5
+        FROM {FORM_VIEW}
+        {where}
+        ORDER BY pts_l5_vs_season DESC
+        LIMIT ?;
+        """,
+        params + [args.limit],
+    )
+    print_rows(cur)
+    conn.close()
+
+
+# -------------------------
+# Import-time report
+# -------------------------
+
+IMPORT_PROBE = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+t = time.perf_counter()
+import ncaa
+ncaa.load_command({name!r})
+ms = (time.perf_counter() - t) * 1000
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(f"{{ms:.1f}}|{{','.join(heavy)}}")
+"""
+
+
+def import_report_command(argv: list[str]) -> None:
+    import argparse
+    import subprocess
+
+    parser = argparse.ArgumentParser(prog="ncaa import-report")
+    parser.add_argument("--budget-ms", type=float, default=LIGHT_IMPORT_BUDGET_MS,
+                        help="max import time for light commands")
+    args = parser.parse_args(argv)
+
+    def probe(name: str) -> tuple[float, str]:
+        code = IMPORT_PROBE.format(scripts=str(SCRIPTS_DIR), name=name, heavy=HEAVY_MODULES)
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        ms, heavy = out.split("|")
+        return float(ms), heavy
+
+    print(f"{'command':<15} {'kind':<6} {'import ms':>10}  heavy modules loaded")
+    failures = []
+    for name, cmd in COMMANDS.items():
+        ms, heavy = probe(name)
+        kind = "light" if cmd.light else "heavy"
+        flag = ""
+        if cmd.light and (heavy or ms > args.budget_ms):
+            flag = "  <-- over budget"
+            failures.append(name)
+        print(f"{name:<15} {kind:<6} {ms:>10.1f}  {heavy or '-'}{flag}")
+
+    if failures:
+        print(f"\n{len(failures)} light command(s) over budget: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\nAll light commands import in under {args.budget_ms:.0f} ms "
+          "without pandas/NumPy/bs4.")
+
+
+# -------------------------
+# Dispatch
+# -------------------------
+
+def load_command(name: str):
+    """Import the module behind `name` and return its entry function."""
+    import importlib
+
+    cmd = COMMANDS[name]
+    if cmd.module == "ncaa":
+        return globals()[cmd.func]
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    return getattr(importlib.import_module(cmd.module), cmd.func)
+
+
+def print_help() -> None:
+    print(__doc__.strip().splitlines()[0])
+    print("\nusage: python scripts/ncaa.py <command> [args...]\n\ncommands:")
+    for name, cmd in COMMANDS.items():
+        print(f"  {name:<15} {cmd.help}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help", "help"):
+        print_help()
+        return
+
+    name, rest = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"ncaa: unknown command {name!r}\n")
+        print_help()
+        sys.exit(2)
+
+    cmd = COMMANDS[name]
+    func = load_command(name)
+    if cmd.module == "ncaa":
+        func(rest)
+    elif cmd.takes_args:
+        # let the script's own argparse see just its arguments
+        sys.argv = [f"ncaa {name}"] + rest
+        func()
+    else:
+        if rest:
+            sys.exit(f"ncaa {name}: takes no arguments")
+        func()
+
+
+if __name__ == "__main__":
+    main()
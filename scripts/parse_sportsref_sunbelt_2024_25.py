@@ -2,6 +2,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from stage_metrics import instrument_stage
+
 # -------------------------
 # Paths
 # -------------------------
@@ -24,18 +26,28 @@ OUT_DIR = (
     / "2024-25"
 )
 
-SPORTSREF_YEAR = 2025  # 2024-25 season
+TEAM_TOTALS_CSV = OUT_DIR / "sun_belt_2024_25_team_totals.csv"
+
+# "Player" labels of the non-player rows in the per-game table
+TEAM_TOTALS_LABEL = "Team Totals"
+NON_PLAYER_LABELS = {"Team", TEAM_TOTALS_LABEL, "Opponents", "Opponent"}
 
 
 # -------------------------
 # Core parsing logic
 # -------------------------
 
-def extract_team_per_game(html_path: Path) -> pd.DataFrame | None:
+def extract_team_per_game(html_path: Path) -> tuple[pd.DataFrame, pd.DataFrame] | None:
     """
-    Given a Sports-Reference team HTML file, return the per-game player stats table
-    as a DataFrame, or None if not found.
+    Given a Sports-Reference team HTML file, return (player rows, Team Totals row)
+    from the per-game stats table, or None if not found.
     """
+    # stem looks like "arkansas-state_2025"
+    team_slug, _, season_str = html_path.stem.rpartition("_")
+    if not team_slug or not season_str.isdigit():
+        print(f"  Skipping {html_path.name}: expected <team-slug>_<season>.html")
+        return None
+
     print(f"Parsing {html_path.name} ...")
 
     # read_html will pull all tables on the page into a list of DataFrames
@@ -62,43 +74,71 @@ def extract_team_per_game(html_path: Path) -> pd.DataFrame | None:
     # Normalize column names to strings
     df.columns = [str(c) for c in df.columns]
 
-    # Drop rows that are clearly totals or non-players
-    if "Player" in df.columns:
-        df = df[df["Player"].notna()]
-        bad_labels = {"Team", "Team Totals", "Opponents", "Opponent"}
-        df = df[~df["Player"].isin(bad_labels)]
-
     # Add team + season metadata
-    team_slug = html_path.stem.replace(f"_{SPORTSREF_YEAR}", "")
     df.insert(0, "team_slug", team_slug)
-    df.insert(1, "season", SPORTSREF_YEAR)
+    df.insert(1, "season", int(season_str))
 
-    return df
+    # Split off totals / non-player rows; the Team Totals row is kept to
+    # cross-check the team aggregates built from the player rows.
+    if "Player" not in df.columns:
+        return df, df.iloc[0:0]
+    df = df[df["Player"].notna()]
+    totals = df[df["Player"] == TEAM_TOTALS_LABEL]
+    df = df[~df["Player"].isin(NON_PLAYER_LABELS)]
 
+    return df, totals
 
-def main():
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+def parse_all_teams(
+    write_csvs: bool = True, raw_dir: Path = RAW_DIR, out_dir: Path = OUT_DIR
+) -> tuple[pd.DataFrame | None, pd.DataFrame | None]:
+    """
+    Parse every raw team page and return the combined per-game DataFrame and
+    the teams' Team Totals rows (each None if nothing parsed). Per-team CSVs
+    are written when write_csvs is set.
+    """
     all_dfs = []
+    all_totals = []
 
-    for html_path in sorted(RAW_DIR.glob("*.html")):
-        df = extract_team_per_game(html_path)
-        if df is None:
+    for html_path in sorted(raw_dir.glob("*.html")):
+        extracted = extract_team_per_game(html_path)
+        if extracted is None:
             continue
-
-        out_csv = OUT_DIR / f"{html_path.stem}_per_game.csv"
-        df.to_csv(out_csv, index=False)
+        df, totals = extracted
+        if not totals.empty:
+            all_totals.append(totals)
+
+        if write_csvs:
+            out_csv = out_dir / f"{html_path.stem}_per_game.csv"
+            df.to_csv(out_csv, index=False)
+            print(f"  -> wrote {out_csv.name} ({len(df)} rows)")
         all_dfs.append(df)
-        print(f"  -> wrote {out_csv.name} ({len(df)} rows)")
-
-    if all_dfs:
-        combined = pd.concat(all_dfs, ignore_index=True)
-        combined_csv = OUT_DIR / "sun_belt_2024_25_per_game_all_teams.csv"
-        combined.to_csv(combined_csv, index=False)
-        print(
-            f"\nWrote combined file: {combined_csv.name} ({len(combined)} rows)")
-    else:
-        print("No per-game tables parsed for any team.")
+
+    if not all_dfs:
+        return None, None
+    totals = pd.concat(all_totals, ignore_index=True) if all_totals else None
+    return pd.concat(all_dfs, ignore_index=True), totals
+
+
+def main():
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    with instrument_stage("parse_per_game") as m:
+        m.rows_in = len(list(RAW_DIR.glob("*.html")))
+        combined, totals = parse_all_teams()
+
+        if combined is not None:
+            combined_csv = OUT_DIR / "sun_belt_2024_25_per_game_all_teams.csv"
+            combined.to_csv(combined_csv, index=False)
+            m.rows_out = len(combined)
+            print(
+                f"\nWrote combined file: {combined_csv.name} ({len(combined)} rows)")
+            if totals is not None:
+                totals.to_csv(TEAM_TOTALS_CSV, index=False)
+                print(f"Wrote team totals: {TEAM_TOTALS_CSV.name} ({len(totals)} teams)")
+        else:
+            m.rows_out = 0
+            print("No per-game tables parsed for any team.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+from io import StringIO
+import html
+from pathlib import Path
+import re
+import sys
+
+import pandas as pd
+
+from stage_metrics import StageMetrics, instrument_stage
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+RAW_DIR = PROJECT_ROOT / "ncaa-analytics" / "data_raw" / "sun_belt" / "2024-25" / "gamelogs"
+INTERMEDIATE_DIR = PROJECT_ROOT / "ncaa-analytics" / \
+    "data_intermediate" / "sun_belt" / "2024-25"
+
+OUT_CSV = INTERMEDIATE_DIR / "sun_belt_2024_25_game_logs.csv"
+# One CSV per game log page; a page is only re-parsed when its HTML is newer.
+PAGE_CSV_DIR = INTERMEDIATE_DIR / "gamelogs"
+
+# Box-score columns kept from each game row, in CSV order.
+STAT_COLUMNS = [
+    "gs", "mp", "fg", "fga", "fg3", "fg3a", "ft", "fta",
+    "orb", "drb", "trb", "ast", "stl", "blk", "tov", "pf", "pts",
+]
+GAMELOG_COLUMNS = [
+    "player", "team_slug", "season", "game_date", "opp", "location", "result",
+] + STAT_COLUMNS
+
+RENAME = {
+    "date": "game_date",
+    "opp": "opp",
+    "opponent": "opp",
+    "result": "result",
+    "gs": "gs",
+    "mp": "mp",
+    "fg": "fg",
+    "fga": "fga",
+    "3p": "fg3",
+    "3pa": "fg3a",
+    "ft": "ft",
+    "fta": "fta",
+    "orb": "orb",
+    "drb": "drb",
+    "trb": "trb",
+    "ast": "ast",
+    "stl": "stl",
+    "blk": "blk",
+    "tov": "tov",
+    "pf": "pf",
+    "pts": "pts",
+}
+
+LOCATIONS = {"@": "away", "N": "neutral"}
+
+H1_RE = re.compile(r"<h1[^>]*>\s*(?:<span>)?(.*?)(?:</span>)?\s*</h1>", re.S)
+TITLE_SUFFIX_RE = re.compile(r"\s+\d{4}-\d{2}\s+Game Log\s*$")
+
+
+class GamelogParseError(RuntimeError):
+    """One or more game log pages failed to parse; `failures` is [(file name, error)]."""
+
+    def __init__(self, failures: list[tuple[str, str]]):
+        self.failures = failures
+        lines = [f"  - {name}: {error}" for name, error in failures[:10]]
+        if len(failures) > 10:
+            lines.append("  ...")
+        super().__init__(
+            f"{len(failures)} game log page(s) failed to parse:\n" + "\n".join(lines))
+
+
+def player_name_from_page(page: str) -> str | None:
+    """'Jalen Smith 2024-25 Game Log' in the page <h1> -> 'Jalen Smith'."""
+    match = H1_RE.search(page)
+    if not match:
+        return None
+    text = html.unescape(re.sub(r"<[^>]+>", "", match.group(1))).strip()
+    return TITLE_SUFFIX_RE.sub("", text) or None
+
+
+def find_gamelog_table(tables: list[pd.DataFrame]) -> pd.DataFrame | None:
+    for tbl in tables:
+        cols_lower = [str(c).strip().lower() for c in tbl.columns]
+        if "date" in cols_lower and "pts" in cols_lower:
+            return tbl
+    return None
+
+
+def parse_gamelog_file(html_path: Path) -> pd.DataFrame | None:
+    # stem looks like "troy__jalen-smith-1_2025"
+    team_slug, rest = html_path.stem.split("__", 1)
+    season = int(rest.rsplit("_", 1)[1])
+
+    page = html_path.read_text(encoding="utf-8")
+    player = player_name_from_page(page)
+    if player is None:
+        raise ValueError(f"No player name (<h1>) in {html_path.name}")
+
+    try:
+        tables = pd.read_html(StringIO(page), flavor="bs4")
+    except ValueError:
+        return None
+    df = find_gamelog_table(tables)
+    if df is None:
+        return None
+
+    rename_map = {}
+    for col in df.columns:
+        low = str(col).strip().lower()
+        if low in RENAME:
+            rename_map[col] = RENAME[low]
+        elif low.startswith("unnamed"):
+            # Sports-Reference leaves the home/away column (and, on older
+            # layouts, the W/L column) without a header.
+            values = set(df[col].dropna().astype(str).str.strip())
+            if values and values <= set(LOCATIONS):
+                rename_map[col] = "location"
+            elif values and all(v[:1] in ("W", "L") for v in values):
+                rename_map[col] = "result"
+    df = df.rename(columns=rename_map)
+
+    # Repeated header rows and the season-total row have no real date;
+    # "Did Not Play" / "Inactive" rows have no minutes.
+    df["game_date"] = pd.to_datetime(df["game_date"], errors="coerce")
+    for col in STAT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce") if col in df.columns else None
+    df = df[df["game_date"].notna() & df["mp"].notna()].copy()
+
+    df["game_date"] = df["game_date"].dt.strftime("%Y-%m-%d")
+    df["location"] = (
+        df["location"].map(lambda v: LOCATIONS.get(str(v).strip(), "home"))
+        if "location" in df.columns else "home"
+    )
+    for col in ("opp", "result"):
+        if col not in df.columns:
+            df[col] = None
+    df["player"] = player
+    df["team_slug"] = team_slug
+    df["season"] = season
+
+    return df[GAMELOG_COLUMNS]
+
+
+def parse_all_gamelogs(
+    raw_dir: Path = RAW_DIR,
+    pattern: str = "*_2025.html",
+    cache_dir: Path | None = None,
+    metrics: StageMetrics | None = None,
+) -> pd.DataFrame | None:
+    """
+    Parse every saved game log page into one DataFrame (or None). With
+    `cache_dir`, each page's rows are kept in {cache_dir}/{stem}.csv and pages
+    whose HTML is not newer than that CSV are read from it instead.
+
+    A page that fails to parse doesn't stop the others, but once all pages
+    are done GamelogParseError is raised, so a player's games are never
+    silently dropped.
+    """
+    all_rows = []
+    failures = []
+    cached = 0
+
+    html_files = sorted(raw_dir.glob(pattern))
+    if not html_files:
+        print(f"No game log pages found in {raw_dir}")
+        return None
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+    for html_path in html_files:
+        page_csv = None if cache_dir is None else cache_dir / f"{html_path.stem}.csv"
+        if page_csv is not None and page_csv.exists() \
+                and page_csv.stat().st_mtime_ns >= html_path.stat().st_mtime_ns:
+            all_rows.append(pd.read_csv(page_csv))
+            cached += 1
+            continue
+        try:
+            df_player = parse_gamelog_file(html_path)
+        except Exception as e:
+            print(f"  !! ERROR on {html_path.name}: {e}")
+            failures.append((html_path.name, str(e)))
+            continue
+        if df_player is None:
+            df_player = pd.DataFrame(columns=GAMELOG_COLUMNS)
+        if page_csv is not None:
+            df_player.to_csv(page_csv, index=False)
+        all_rows.append(df_player)
+
+    print(f"Parsed {len(html_files) - cached} of {len(html_files)} game log pages "
+          f"({cached} unchanged)")
+    if metrics is not None:
+        metrics.extra["failed_pages"] = len(failures)
+    if failures:
+        raise GamelogParseError(failures)
+    all_rows = [df for df in all_rows if not df.empty]
+    if not all_rows:
+        return None
+    return pd.concat(all_rows, ignore_index=True)
+
+
+def main():
+    INTERMEDIATE_DIR.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with instrument_stage("parse_gamelogs") as m:
+            m.rows_in = len(list(RAW_DIR.glob("*_2025.html")))
+            games_df = parse_all_gamelogs(cache_dir=PAGE_CSV_DIR, metrics=m)
+            m.rows_out = 0 if games_df is None else len(games_df)
+            if games_df is None:
+                return
+
+            games_df.to_csv(OUT_CSV, index=False)
+    except GamelogParseError as e:
+        sys.exit(str(e))
+    print(f"\nWrote combined game log CSV: {OUT_CSV} ({len(games_df)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from pathlib import Path
 import pandas as pd
 
+from stage_metrics import instrument_stage
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 RAW_DIR = PROJECT_ROOT / "ncaa-analytics" / "data_raw" / "sun_belt" / "2024-25"
@@ -112,13 +114,16 @@ def parse_roster_file(html_path: Path) -> pd.DataFrame:
     return df
 
 
-def main():
+def parse_all_rosters(
+    raw_dir: Path = RAW_DIR, pattern: str = "*_2025.html"
+) -> pd.DataFrame | None:
+    """Parse every raw team page's roster table into one DataFrame (or None)."""
     all_rows = []
 
-    html_files = sorted(RAW_DIR.glob("*_2025.html"))
+    html_files = sorted(raw_dir.glob(pattern))
     if not html_files:
-        print(f"No HTML files found in {RAW_DIR}")
-        return
+        print(f"No HTML files found in {raw_dir}")
+        return None
 
     for html_path in html_files:
         print(f"Parsing roster from {html_path.name} ...")
@@ -131,10 +136,20 @@ def main():
 
     if not all_rows:
         print("No roster data parsed.")
-        return
+        return None
 
-    roster_df = pd.concat(all_rows, ignore_index=True)
-    roster_df.to_csv(OUT_CSV, index=False)
+    return pd.concat(all_rows, ignore_index=True)
+
+
+def main():
+    with instrument_stage("parse_rosters") as m:
+        m.rows_in = len(list(RAW_DIR.glob("*_2025.html")))
+        roster_df = parse_all_rosters()
+        m.rows_out = 0 if roster_df is None else len(roster_df)
+        if roster_df is None:
+            return
+
+        roster_df.to_csv(OUT_CSV, index=False)
     print(f"\nWrote combined roster CSV: {OUT_CSV} ({len(roster_df)} rows)")
 
 
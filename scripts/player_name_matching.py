@@ -0,0 +1,291 @@
+"""
+Blocked fuzzy matching of roster names to players.full_name.
+
+Roster tables and per-game tables don't always spell a player the same way
+(suffixes, accents, nicknames, punctuation). Rather than scoring every roster
+name against every player, candidates are blocked by (team_id, season) and
+then by a phonetic key on the last name or the first initial, and only pairs
+inside a block are scored.
+
+Resolved matches are persisted to the player_name_aliases table so later runs
+resolve them with a plain join.
+"""
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+import re
+import sqlite3
+import time
+import unicodedata
+
+ALIAS_TABLE = "player_name_aliases"
+
+MATCH_THRESHOLD = 0.85
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Common first-name variants, mapped to one canonical form.
+NICKNAMES = {
+    "alex": "alexander",
+    "andy": "andrew",
+    "ben": "benjamin",
+    "bill": "william",
+    "billy": "william",
+    "bob": "robert",
+    "bobby": "robert",
+    "cam": "cameron",
+    "chris": "christopher",
+    "dan": "daniel",
+    "danny": "daniel",
+    "dave": "david",
+    "jake": "jacob",
+    "jim": "james",
+    "jimmy": "james",
+    "joe": "joseph",
+    "joey": "joseph",
+    "jon": "jonathan",
+    "josh": "joshua",
+    "matt": "matthew",
+    "mike": "michael",
+    "nate": "nathan",
+    "nick": "nicholas",
+    "rob": "robert",
+    "sam": "samuel",
+    "steve": "steven",
+    "tom": "thomas",
+    "tony": "anthony",
+    "will": "william",
+    "zach": "zachary",
+}
+
+ALIAS_DDL = f"""
+CREATE TABLE IF NOT EXISTS {ALIAS_TABLE} (
+    alias_name TEXT    NOT NULL,
+    team_id    INTEGER NOT NULL,
+    season     INTEGER NOT NULL,
+    player_id  INTEGER NOT NULL,
+    score      REAL    NOT NULL,
+    method     TEXT    NOT NULL,   -- 'normalized' or 'fuzzy'
+    created_at TEXT    NOT NULL DEFAULT (datetime('now')),
+
+    PRIMARY KEY (alias_name, team_id, season),
+    FOREIGN KEY (player_id) REFERENCES players(player_id),
+    FOREIGN KEY (team_id)   REFERENCES teams(team_id)
+);
+"""
+
+
+# -------------------------
+# Normalization + keys
+# -------------------------
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase, strip accents and punctuation, drop generational suffixes and
+    canonicalize common nicknames on the first token.
+    """
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower().replace("'", "").replace("’", "")
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    tokens = [tok for tok in text.split() if tok not in NAME_SUFFIXES]
+    if tokens:
+        tokens[0] = NICKNAMES.get(tokens[0], tokens[0])
+    return " ".join(tokens)
+
+
+def soundex(word: str) -> str:
+    """Classic 4-character American Soundex code ('' for empty input)."""
+    word = "".join(ch for ch in word.lower() if ch.isalpha())
+    if not word:
+        return ""
+    codes = {}
+    for letters, digit in (("bfpv", "1"), ("cgjkqsxz", "2"), ("dt", "3"),
+                           ("l", "4"), ("mn", "5"), ("r", "6")):
+        for ch in letters:
+            codes[ch] = digit
+
+    out = [word[0].upper()]
+    prev = codes.get(word[0], "")
+    for ch in word[1:]:
+        digit = codes.get(ch, "")
+        if digit and digit != prev:
+            out.append(digit)
+        if ch not in "hw":
+            prev = digit
+    return ("".join(out) + "000")[:4]
+
+
+def blocking_keys(normalized: str) -> set[str]:
+    """
+    Sub-block keys inside a (team, season) block: Soundex of the last name and
+    the first initial. Two names are compared if they share either key.
+    """
+    tokens = normalized.split()
+    if not tokens:
+        return set()
+    return {f"sx:{soundex(tokens[-1])}", f"fi:{tokens[0][0]}"}
+
+
+def score_names(a: str, b: str) -> float:
+    """Similarity in [0, 1] between two already-normalized names."""
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+# -------------------------
+# Matching engine
+# -------------------------
+
+@dataclass
+class MatchReport:
+    # fuzzy pass: names left after the exact and alias joins
+    total: int = 0
+    matched: int = 0
+    blocks: int = 0
+    comparisons: int = 0
+    block_seconds: dict[tuple[int, int], float] = field(default_factory=dict)
+    # whole roster, filled in by the caller
+    roster_total: int = 0
+    exact: int = 0
+    alias: int = 0
+
+    @property
+    def match_rate(self) -> float:
+        return self.matched / self.total if self.total else 1.0
+
+    @property
+    def roster_matched(self) -> int:
+        return self.exact + self.alias + self.matched
+
+    @property
+    def roster_match_rate(self) -> float:
+        return self.roster_matched / self.roster_total if self.roster_total else 1.0
+
+    def print_summary(self) -> None:
+        print(
+            f"Roster names: {self.roster_matched}/{self.roster_total} matched "
+            f"({self.roster_match_rate:.1%}): {self.exact} exact, "
+            f"{self.alias} alias, {self.matched} fuzzy."
+        )
+        if not self.total:
+            return
+        print(
+            f"Fuzzy matcher: {self.matched}/{self.total} names matched "
+            f"({self.match_rate:.1%}) across {self.blocks} blocks, "
+            f"{self.comparisons} comparisons."
+        )
+        if self.block_seconds:
+            times = sorted(self.block_seconds.values())
+            mean_ms = 1000 * sum(times) / len(times)
+            print(
+                f"  time per block: mean {mean_ms:.2f} ms, "
+                f"max {1000 * times[-1]:.2f} ms"
+            )
+
+
+def ensure_alias_table(conn: sqlite3.Connection) -> None:
+    conn.execute(ALIAS_DDL)
+
+
+def match_block(
+    names: list[str],
+    candidates: list[tuple[int, str]],
+    threshold: float = MATCH_THRESHOLD,
+) -> tuple[list[tuple[str, int, float, str]], int]:
+    """
+    Match unresolved names to candidate (player_id, full_name) pairs from one
+    (team, season) block. Each player is used at most once; best scores win.
+
+    Returns ([(name, player_id, score, method), ...], comparisons).
+    """
+    cand_norm = [(pid, normalize_name(full)) for pid, full in candidates]
+    by_key: dict[str, list[int]] = {}
+    for idx, (_, norm) in enumerate(cand_norm):
+        for key in blocking_keys(norm):
+            by_key.setdefault(key, []).append(idx)
+
+    scored = []
+    comparisons = 0
+    for name in names:
+        norm = normalize_name(name)
+        seen = set()
+        for key in blocking_keys(norm):
+            for idx in by_key.get(key, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                comparisons += 1
+                score = score_names(norm, cand_norm[idx][1])
+                if score >= threshold:
+                    scored.append((score, name, idx))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    used_names, used_players = set(), set()
+    matches = []
+    for score, name, idx in scored:
+        if name in used_names or idx in used_players:
+            continue
+        used_names.add(name)
+        used_players.add(idx)
+        method = "normalized" if score == 1.0 else "fuzzy"
+        matches.append((name, cand_norm[idx][0], score, method))
+    return matches, comparisons
+
+
+def resolve_unmatched(
+    conn: sqlite3.Connection,
+    unmatched: list[tuple[str, int, int]],
+    threshold: float = MATCH_THRESHOLD,
+    stage_table: str = "roster_stage",
+) -> MatchReport:
+    """
+    Fuzzy-match (name, team_id, season) rows that failed an exact join and
+    persist resolved pairs to the alias table.
+
+    Candidates per block are players in that (team_id, season) that aren't
+    already claimed by an exact roster match or an existing alias; the caller
+    is expected to have staged the roster in a TEMP table with a resolved
+    player_id column.
+    """
+    ensure_alias_table(conn)
+    report = MatchReport(total=len(unmatched))
+
+    blocks: dict[tuple[int, int], list[str]] = {}
+    for name, team_id, season in unmatched:
+        blocks.setdefault((team_id, season), []).append(name)
+    report.blocks = len(blocks)
+
+    new_aliases = []
+    for (team_id, season), names in blocks.items():
+        start = time.perf_counter()
+        candidates = conn.execute(
+            f"""
+            SELECT p.player_id, p.full_name
+            FROM players AS p
+            WHERE p.team_id = ?
+              AND p.season  = ?
+              AND p.player_id NOT IN (
+                  SELECT player_id FROM temp.{stage_table}
+                  WHERE player_id IS NOT NULL
+              );
+            """,
+            (team_id, season),
+        ).fetchall()
+        matches, comparisons = match_block(names, candidates, threshold)
+        report.comparisons += comparisons
+        report.matched += len(matches)
+        for name, player_id, score, method in matches:
+            new_aliases.append(
+                (name, team_id, season, player_id, round(score, 4), method))
+        report.block_seconds[(team_id, season)] = time.perf_counter() - start
+
+    conn.executemany(
+        f"""
+        INSERT OR REPLACE INTO {ALIAS_TABLE}
+            (alias_name, team_id, season, player_id, score, method)
+        VALUES (?, ?, ?, ?, ?, ?);
+        """,
+        new_aliases,
+    )
+    return report
@@ -0,0 +1,663 @@
+"""
+Dependency-aware runner for the Sun Belt 2024-25 pipeline.
+
+Each README step is declared as a stage with its upstream stages, input files
+and outputs. A stage's fingerprint is a hash of its script source, its input
+file contents and its upstream fingerprints; a stage whose fingerprint matches
+the last successful run (and whose outputs still exist) is skipped. Stages
+whose dependencies are satisfied run concurrently, except that stages writing
+the SQLite DB are serialized against each other.
+
+Once the warehouse has been published (ncaa_dev.db is a snapshot symlink), DB
+stages write to a staging copy of the live snapshot instead, and the copy is
+validated and published as a new snapshot after all stages succeed.
+
+Usage:
+    python scripts/run_sunbelt_2024_25_pipeline.py            # incremental
+    python scripts/run_sunbelt_2024_25_pipeline.py --force    # rerun all but scrape
+    python scripts/run_sunbelt_2024_25_pipeline.py --scrape   # re-download HTML
+    python scripts/run_sunbelt_2024_25_pipeline.py --in-memory
+                                                   # single-process rebuild
+    python scripts/run_sunbelt_2024_25_pipeline.py --publish
+                                                   # rebuild into a snapshot + swap
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import argparse
+import hashlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+from stage_metrics import instrument_stage
+from warehouse_snapshots import (
+    KEEP_SNAPSHOTS, STAGING_ENV, is_published, publish_snapshot, remove_db, start_staging,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = PROJECT_ROOT / "scripts"
+
+RAW_DIR = PROJECT_ROOT / "ncaa-analytics" / "data_raw" / "sun_belt" / "2024-25"
+INTERMEDIATE_DIR = PROJECT_ROOT / "ncaa-analytics" / \
+    "data_intermediate" / "sun_belt" / "2024-25"
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+STATE_PATH = PROJECT_ROOT / "ncaa-analytics" / "pipeline_state.json"
+
+PER_GAME_CSV = INTERMEDIATE_DIR / "sun_belt_2024_25_per_game_all_teams.csv"
+TEAM_TOTALS_CSV = INTERMEDIATE_DIR / "sun_belt_2024_25_team_totals.csv"
+ROSTER_CSV = INTERMEDIATE_DIR / "sun_belt_2024_25_roster_all_teams.csv"
+GAMELOG_DIR = RAW_DIR / "gamelogs"
+GAMELOG_CSV = INTERMEDIATE_DIR / "sun_belt_2024_25_game_logs.csv"
+EXPORT_DIR = PROJECT_ROOT / "ncaa-analytics" / "exports"
+RAW_HTML_GLOB = "*_2025.html"
+
+
+# -------------------------
+# Stage graph
+# -------------------------
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    script: str
+    deps: tuple[str, ...] = ()
+    # (directory, glob) pairs or single files whose contents feed the stage
+    inputs: tuple = ()
+    outputs: tuple[Path, ...] = ()
+    writes_db: bool = False
+    # extra local modules the script imports (hashed with the script)
+    sources: tuple[str, ...] = ()
+    # stages with no file inputs (network fetches) only run when forced
+    # or when their outputs are missing
+    always_cached: bool = False
+
+
+STAGES = (
+    Stage(
+        name="scrape",
+        script="scrape_sunbelt_2024_25.py",
+        outputs=(RAW_DIR,),
+        always_cached=True,
+    ),
+    Stage(
+        name="parse_per_game",
+        script="parse_sportsref_sunbelt_2024_25.py",
+        deps=("scrape",),
+        inputs=((RAW_DIR, RAW_HTML_GLOB),),
+        outputs=(PER_GAME_CSV, TEAM_TOTALS_CSV),
+    ),
+    Stage(
+        name="parse_rosters",
+        script="parse_sportsref_sunbelt_2024_25_rosters.py",
+        deps=("scrape",),
+        inputs=((RAW_DIR, RAW_HTML_GLOB),),
+        outputs=(ROSTER_CSV,),
+    ),
+    Stage(
+        name="load",
+        script="load_sunbelt_2024_25_sqlite.py",
+        deps=("parse_per_game",),
+        inputs=(PER_GAME_CSV, TEAM_TOTALS_CSV),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="schema",
+        script="init_sun_belt_v0_schema.py",
+        deps=("load",),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="season_stats",
+        script="init_sunbelt_v0_season_stats.py",
+        deps=("schema",),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="team_stats",
+        script="init_sunbelt_v0_team_season_stats.py",
+        deps=("season_stats",),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="similarity",
+        script="compute_sunbelt_2024_25_similarity.py",
+        deps=("season_stats",),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="roster_update",
+        script="update_players_from_sunbelt_rosters_2024_25.py",
+        deps=("schema", "parse_rosters"),
+        inputs=(ROSTER_CSV,),
+        outputs=(DB_PATH,),
+        writes_db=True,
+        sources=("player_name_matching.py",),
+    ),
+    Stage(
+        name="profile_view",
+        script="init_sunbelt_v0_player_profile_view.py",
+        deps=("season_stats", "roster_update"),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="scrape_gamelogs",
+        script="scrape_sunbelt_2024_25_gamelogs.py",
+        deps=("scrape",),
+        outputs=(GAMELOG_DIR,),
+        always_cached=True,
+    ),
+    Stage(
+        name="parse_gamelogs",
+        script="parse_sportsref_sunbelt_2024_25_gamelogs.py",
+        deps=("scrape_gamelogs",),
+        inputs=((GAMELOG_DIR, RAW_HTML_GLOB),),
+        outputs=(GAMELOG_CSV,),
+    ),
+    Stage(
+        name="game_logs",
+        script="init_sunbelt_v0_game_logs.py",
+        deps=("season_stats", "roster_update", "parse_gamelogs"),
+        inputs=(GAMELOG_CSV,),
+        outputs=(DB_PATH,),
+        writes_db=True,
+        sources=("parse_sportsref_sunbelt_2024_25_gamelogs.py",),
+    ),
+    Stage(
+        name="search_index",
+        script="init_sunbelt_v0_player_search_index.py",
+        deps=("schema", "roster_update"),
+        outputs=(DB_PATH,),
+        writes_db=True,
+    ),
+    Stage(
+        name="export",
+        script="warehouse_export.py",
+        deps=("profile_view", "similarity"),
+        outputs=(EXPORT_DIR / "profiles" / "manifest.json",
+                 EXPORT_DIR / "comps" / "manifest.json"),
+        # only reads the DB, but must not read while another stage writes
+        writes_db=True,
+        sources=("warehouse_snapshots.py",),
+    ),
+)
+
+STAGES_BY_NAME = {stage.name: stage for stage in STAGES}
+
+
+# -------------------------
+# Hashing
+# -------------------------
+
+class FileHasher:
+    """
+    SHA-256 of file contents, memoized on (size, mtime_ns) across runs so a
+    no-op refresh doesn't re-read every raw HTML page.
+    """
+
+    def __init__(self, cache: dict):
+        self.cache = cache
+        self.lock = threading.Lock()
+
+    def hash_file(self, path: Path) -> str:
+        st = path.stat()
+        key = str(path)
+        stamp = [st.st_size, st.st_mtime_ns]
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self.lock:
+            self.cache[key] = stamp + [digest]
+        return digest
+
+    def hash_inputs(self, inputs: tuple) -> str:
+        h = hashlib.sha256()
+        for item in inputs:
+            if isinstance(item, tuple):
+                directory, pattern = item
+                paths = sorted(Path(directory).glob(pattern))
+            else:
+                paths = [Path(item)]
+            for path in paths:
+                h.update(str(path.relative_to(PROJECT_ROOT)).encode())
+                h.update(self.hash_file(path).encode()
+                         if path.exists() else b"<missing>")
+        return h.hexdigest()
+
+
+def stage_fingerprint(stage: Stage, hasher: FileHasher, dep_fps: dict[str, str]) -> str:
+    h = hashlib.sha256()
+    for src in (stage.script,) + stage.sources:
+        h.update(hasher.hash_file(SCRIPTS_DIR / src).encode())
+    h.update(hasher.hash_inputs(stage.inputs).encode())
+    for dep in stage.deps:
+        h.update(f"{dep}={dep_fps[dep]}".encode())
+    return h.hexdigest()
+
+
+def outputs_exist(stage: Stage) -> bool:
+    for out in stage.outputs:
+        if not out.exists():
+            return False
+        if out.is_dir() and not any(out.glob(RAW_HTML_GLOB)):
+            return False
+    return True
+
+
+# -------------------------
+# State
+# -------------------------
+
+def load_state() -> dict:
+    if STATE_PATH.exists():
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    return {"stages": {}, "file_hashes": {}}
+
+
+def save_state(state: dict) -> None:
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(STATE_PATH)
+
+
+# -------------------------
+# Runner
+# -------------------------
+
+@dataclass
+class StageResult:
+    name: str
+    status: str  # 'ran', 'skipped', 'failed', 'blocked'
+    seconds: float = 0.0
+    fingerprint: str = ""
+    output: str = field(default="", repr=False)
+
+
+def run_script(stage: Stage) -> tuple[bool, str]:
+    proc = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / stage.script)],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return proc.returncode == 0, proc.stdout + proc.stderr
+
+
+def set_wal_mode(db_path: Path = DB_PATH) -> None:
+    """
+    Put the warehouse in WAL mode (it sticks to the file) so the read-only
+    API never blocks, or is blocked by, the stages writing to it.
+    """
+    if not db_path.exists():
+        return
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+    finally:
+        conn.close()
+
+
+def run_pipeline(
+    force: bool = False,
+    scrape: bool = False,
+    jobs: int = 4,
+    dry_run: bool = False,
+    run_stage=run_script,
+    keep: int = KEEP_SNAPSHOTS,
+) -> list[StageResult]:
+    """
+    Run the stage graph. `run_stage(stage) -> (ok, output)` executes one stage;
+    the default runs the stage's script in a subprocess.
+
+    If the warehouse is published, the first DB stage to run copies the live
+    snapshot to a staging DB (STAGING_ENV points the stages at it). When every
+    stage succeeds the copy is published, keeping `keep` snapshots; otherwise
+    it's discarded and the DB stages' fingerprints are left as they were so
+    the next run redoes them.
+    """
+    state = load_state()
+    hasher = FileHasher(state.setdefault("file_hashes", {}))
+    recorded = state.setdefault("stages", {})
+
+    db_lock = threading.Lock()
+    state_lock = threading.Lock()
+
+    fingerprints: dict[str, str] = {}
+    results: dict[str, StageResult] = {}
+    pending = {stage.name for stage in STAGES}
+    published = is_published()
+    staging = {}  # {"path": Path} once a DB stage has copied the live snapshot
+    previous = dict(recorded)
+    if not dry_run and not published:
+        set_wal_mode()
+
+    def execute(stage: Stage) -> StageResult:
+        fp = stage_fingerprint(stage, hasher, fingerprints)
+        prev = recorded.get(stage.name, {})
+        # --force rebuilds derived stages; network fetches need --scrape
+        forced = scrape if stage.always_cached else force
+        if stage.always_cached:
+            up_to_date = not forced and outputs_exist(stage)
+        else:
+            up_to_date = (
+                not forced
+                and prev.get("fingerprint") == fp
+                and outputs_exist(stage)
+            )
+        if up_to_date or dry_run:
+            status = "skipped" if up_to_date else "would-run"
+            return StageResult(stage.name, status, 0.0, fp)
+
+        # time the stage itself, not how long it queued for the DB lock
+        if stage.writes_db:
+            with db_lock:
+                if published and "path" not in staging:
+                    staging["path"] = start_staging()
+                    os.environ[STAGING_ENV] = str(staging["path"])
+                start = time.perf_counter()
+                ok, output = run_stage(stage)
+                seconds = time.perf_counter() - start
+        else:
+            start = time.perf_counter()
+            ok, output = run_stage(stage)
+            seconds = time.perf_counter() - start
+
+        if not ok:
+            return StageResult(stage.name, "failed", seconds, fp, output)
+
+        with state_lock:
+            recorded[stage.name] = {
+                "fingerprint": fp,
+                "seconds": round(seconds, 3),
+                "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+        return StageResult(stage.name, "ran", seconds, fp, output)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        running = {}
+        while pending or running:
+            for name in sorted(pending):
+                stage = STAGES_BY_NAME[name]
+                if any(dep in pending or dep in {s.name for s in running.values()}
+                       for dep in stage.deps):
+                    continue
+                if any(results[dep].status in ("failed", "blocked") for dep in stage.deps):
+                    results[name] = StageResult(name, "blocked")
+                    pending.discard(name)
+                    continue
+                pending.discard(name)
+                running[pool.submit(execute, stage)] = stage
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage = running.pop(fut)
+                result = fut.result()
+                results[stage.name] = result
+                fingerprints[stage.name] = result.fingerprint
+                print(f"[{result.status:>9}] {stage.name:<15} {result.seconds:7.2f}s")
+                if result.status == "failed":
+                    print(result.output)
+    os.environ.pop(STAGING_ENV, None)
+
+    ordered = [results[stage.name] for stage in STAGES]
+    if "path" in staging:
+        ordered.append(publish_staging(staging["path"], ordered, keep))
+        if ordered[-1].status != "ran":
+            # the staged DB changes were dropped; rerun those stages next time
+            for stage in STAGES:
+                if stage.writes_db:
+                    recorded.pop(stage.name, None)
+                    if stage.name in previous:
+                        recorded[stage.name] = previous[stage.name]
+
+    if not dry_run:
+        if not published:
+            set_wal_mode()  # in case this run created the DB
+        save_state(state)
+    return ordered
+
+
+def publish_staging(path: Path, results: list[StageResult], keep: int) -> StageResult:
+    """Validate + publish the staged DB unless a stage failed; always removes it."""
+    start = time.perf_counter()
+    try:
+        if any(r.status in ("failed", "blocked") for r in results):
+            print(f"[{'skipped':>9}] {'publish':<15} (a stage failed; live snapshot unchanged)")
+            return StageResult("publish", "skipped")
+        conn = sqlite3.connect(path)
+        try:
+            version = publish_snapshot(conn, keep=keep)
+        except ValueError as e:
+            print(f"[{'failed':>9}] {'publish':<15} {e}")
+            return StageResult("publish", "failed", time.perf_counter() - start, output=str(e))
+        finally:
+            conn.close()
+    finally:
+        remove_db(path)
+    seconds = time.perf_counter() - start
+    print(f"[{'ran':>9}] {'publish':<15} {seconds:7.2f}s  snapshot {version}")
+    return StageResult("publish", "ran", seconds)
+
+
+# -------------------------
+# Single-process mode
+# -------------------------
+
+def run_in_memory(
+    fresh: bool = False, publish: bool = False, keep: int = KEEP_SNAPSHOTS
+) -> list[StageResult]:
+    """
+    Rebuild the warehouse in one process against one shared in-memory SQLite
+    connection, passing DataFrames between stages instead of CSVs, then write
+    the finished database to DB_PATH with the backup API.
+
+    With `publish`, the result is instead written to a new versioned snapshot,
+    validated and atomically swapped in (see warehouse_snapshots.py), so
+    nothing reading ncaa_dev.db ever sees a partial rebuild.
+
+    Unless `fresh` is set, the existing DB is first copied into memory so
+    player_ids and name aliases stay stable, exactly as a disk run would.
+    Raw HTML must already be on disk; intermediate CSVs are not written
+    (except the per-page game log parse cache).
+    """
+    import compute_sunbelt_2024_25_similarity as similarity
+    import init_sun_belt_v0_schema as schema
+    import init_sunbelt_v0_game_logs as game_logs
+    import init_sunbelt_v0_player_profile_view as profile_view
+    import init_sunbelt_v0_player_search_index as search_index
+    import init_sunbelt_v0_season_stats as season_stats
+    import init_sunbelt_v0_team_season_stats as team_stats
+    import load_sunbelt_2024_25_sqlite as load
+    import parse_sportsref_sunbelt_2024_25 as parse_per_game
+    import parse_sportsref_sunbelt_2024_25_gamelogs as parse_gamelogs
+    import parse_sportsref_sunbelt_2024_25_rosters as parse_rosters
+    import update_players_from_sunbelt_rosters_2024_25 as roster_update
+    import warehouse_export as export
+
+    if not publish and is_published():
+        # backing up over the symlink would rewrite the live snapshot in place
+        print(f"{DB_PATH.name} is a published snapshot; publishing the rebuild instead")
+        publish = True
+    mem = sqlite3.connect(":memory:")
+    mem.execute("PRAGMA foreign_keys = ON;")
+    if DB_PATH.exists() and not fresh:
+        disk = sqlite3.connect(DB_PATH)
+        try:
+            disk.backup(mem)
+        finally:
+            disk.close()
+
+    results = []
+    frames = {}
+
+    def step(name, fn):
+        with instrument_stage(name) as m:
+            value = fn(m)
+        results.append(StageResult(name, "ran", m.wall_seconds))
+        print(f"[{'ran':>9}] {name:<15} {m.wall_seconds:7.2f}s")
+        return value
+
+    def parse_per_game_step(m):
+        df, totals = parse_per_game.parse_all_teams(write_csvs=False)
+        if df is None:
+            raise RuntimeError(f"No per-game tables parsed from {RAW_DIR}")
+        m.rows_out = len(df)
+        frames["team_totals"] = None if totals is None else load.normalize_columns(totals)
+        return load.normalize_columns(df)
+
+    def parse_rosters_step(m):
+        df = parse_rosters.parse_all_rosters()
+        m.rows_out = 0 if df is None else len(df)
+        return None if df is None else roster_update.normalize_roster(df)
+
+    def load_step(m):
+        load.write_table(mem, frames["per_game"])
+        if frames["team_totals"] is not None:
+            load.write_team_totals(mem, frames["team_totals"])
+        m.rows_in = m.rows_out = len(frames["per_game"])
+
+    def team_stats_step(m):
+        written, _, mismatches = team_stats.refresh_team_stats(mem, metrics=m)
+        print(f"  rewrote {written} teams, {len(mismatches)} Team Totals mismatches")
+
+    def similarity_step(m):
+        features = similarity.load_player_features(mem)
+        sim_df = similarity.compute_similarity(features)
+        similarity.write_similarity(mem, sim_df)
+        m.rows_in, m.rows_out = len(features), len(sim_df)
+
+    def roster_update_step(m):
+        if frames["rosters"] is None:
+            return
+        updated, missing = roster_update.apply_roster(mem, frames["rosters"], metrics=m)
+        m.rows_in, m.rows_out = len(frames["rosters"]), updated
+        m.extra["unmatched"] = len(missing)
+        print(f"  updated {updated} players, {len(missing)} roster rows unmatched")
+
+    def parse_gamelogs_step(m):
+        if not GAMELOG_DIR.exists():
+            return None
+        df = parse_gamelogs.parse_all_gamelogs(
+            raw_dir=GAMELOG_DIR, cache_dir=parse_gamelogs.PAGE_CSV_DIR, metrics=m)
+        m.rows_out = 0 if df is None else len(df)
+        return df
+
+    def game_logs_step(m):
+        if frames["gamelogs"] is None:
+            return
+        written, refreshed, missing = game_logs.apply_game_logs(
+            mem, frames["gamelogs"], metrics=m)
+        m.rows_in, m.rows_out = len(frames["gamelogs"]), written
+        m.extra["players_refreshed"] = refreshed
+        print(f"  wrote {written} games, refreshed {refreshed} players, "
+              f"{len(missing)} game log players unmatched")
+
+    def publish_step(m):
+        version = publish_snapshot(mem, keep=keep)
+        frames["version"] = version
+        m.extra["version"] = version
+        print(f"  published snapshot {version}")
+
+    def backup_step(m):
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        disk = sqlite3.connect(DB_PATH)
+        try:
+            mem.backup(disk)
+            disk.execute("PRAGMA journal_mode=WAL;")
+        finally:
+            disk.close()
+
+    try:
+        frames["per_game"] = step("parse_per_game", parse_per_game_step)
+        frames["rosters"] = step("parse_rosters", parse_rosters_step)
+        frames["gamelogs"] = step("parse_gamelogs", parse_gamelogs_step)
+        step("load", load_step)
+        step("schema", lambda m: schema.build_schema(mem))
+        step("season_stats", lambda m: season_stats.build_season_stats(mem, metrics=m))
+        step("team_stats", team_stats_step)
+        step("similarity", similarity_step)
+        step("roster_update", roster_update_step)
+        step("profile_view", lambda m: profile_view.create_profile_view(mem))
+        step("game_logs", game_logs_step)
+        step("search_index", lambda m: search_index.build_search_index(mem))
+        if publish:
+            step("publish", publish_step)
+        else:
+            step("backup_to_disk", backup_step)
+        step("export", lambda m: export.export_datasets(
+            mem, metrics=m, source_version=frames.get("version")))
+    finally:
+        mem.close()
+
+    return results
+
+
+def print_timings(results: list[StageResult], total: float) -> None:
+    print("\nStage timings:")
+    for r in results:
+        print(f"  {r.name:<15} {r.status:>9} {r.seconds:8.2f}s")
+    print(f"  {'total (wall)':<15} {'':>9} {total:8.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--force", action="store_true",
+                        help="rerun every derived stage regardless of fingerprints")
+    parser.add_argument("--scrape", action="store_true",
+                        help="re-download raw HTML (otherwise reuse what's on disk)")
+    parser.add_argument("--jobs", type=int, default=4,
+                        help="max stages to run at the same time")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show which stages would run without running them")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="rebuild everything in one process on an in-memory DB, "
+                             "then back it up to disk")
+    parser.add_argument("--fresh", action="store_true",
+                        help="with --in-memory: start from an empty DB instead of "
+                             "a copy of the current one")
+    parser.add_argument("--publish", action="store_true",
+                        help="build in memory, then publish as a validated snapshot "
+                             "and atomically swap it in (implies --in-memory)")
+    parser.add_argument("--keep", type=int, default=KEEP_SNAPSHOTS,
+                        help="when publishing: number of snapshots to keep for rollback")
+    args = parser.parse_args()
+    if args.keep < 1:
+        parser.error("--keep must be at least 1 (the live snapshot)")
+
+    start = time.perf_counter()
+    if args.in_memory or args.publish:
+        results = run_in_memory(
+            fresh=args.fresh, publish=args.publish, keep=args.keep)
+    else:
+        results = run_pipeline(
+            force=args.force, scrape=args.scrape, jobs=args.jobs, dry_run=args.dry_run,
+            keep=args.keep)
+    print_timings(results, time.perf_counter() - start)
+
+    if any(r.status in ("failed", "blocked") for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
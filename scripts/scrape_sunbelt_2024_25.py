@@ -4,6 +4,8 @@ from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 
+from stage_metrics import instrument_stage
+
 # -------------------------
 # Config
 # -------------------------
@@ -103,14 +105,17 @@ def save_team_page(team_name: str, team_slug: str, url: str) -> None:
 def main():
     ensure_out_dir()
 
-    teams = get_sunbelt_teams()
-    print(f"Found {len(teams)} Sun Belt teams for 2024-25:")
-    for name, slug, url in teams:
-        print(f" - {name} ({slug})")
-
-    for name, slug, url in teams:
-        save_team_page(name, slug, url)
-        time.sleep(1.0)  # politeness delay
+    with instrument_stage("scrape") as m:
+        teams = get_sunbelt_teams()
+        print(f"Found {len(teams)} Sun Belt teams for 2024-25:")
+        for name, slug, url in teams:
+            print(f" - {name} ({slug})")
+        m.rows_in = len(teams)
+
+        for name, slug, url in teams:
+            save_team_page(name, slug, url)
+            time.sleep(1.0)  # politeness delay
+        m.rows_out = len(teams)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""
+Download per-player game log pages for every player on the scraped team pages.
+
+Player links come from the roster table of each team page saved by
+scrape_sunbelt_2024_25.py; each log is saved as
+gamelogs/{team_slug}__{player_slug}_{year}.html next to the team pages.
+
+Game logs change after every game, so a page is re-fetched once it is older
+than --max-age-hours (default 12). Re-running the scrape mid-season therefore
+only downloads logs that could have new games.
+
+Usage:
+    python scripts/scrape_sunbelt_2024_25_gamelogs.py
+    python scripts/scrape_sunbelt_2024_25_gamelogs.py --max-age-hours 0   # refetch all
+"""
+import argparse
+from pathlib import Path
+import time
+
+from bs4 import BeautifulSoup
+
+from scrape_sunbelt_2024_25 import BASE_URL, OUT_DIR as TEAM_PAGE_DIR, SPORTSREF_YEAR, fetch_html
+from stage_metrics import instrument_stage
+
+OUT_DIR = TEAM_PAGE_DIR / "gamelogs"
+
+DEFAULT_MAX_AGE_HOURS = 12.0
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def player_links(team_page: Path) -> list[tuple[str, str]]:
+    """(player_name, player_slug) for each linked player in a team page's roster."""
+    soup = BeautifulSoup(team_page.read_text(encoding="utf-8"), "html.parser")
+    table = soup.find("table", id="roster") or soup
+    links = []
+    seen = set()
+    for a in table.select("a[href*='/cbb/players/']"):
+        # Expect: /cbb/players/{slug}.html
+        slug = a["href"].rstrip("/").rsplit("/", 1)[-1].removesuffix(".html")
+        if slug and slug not in seen:
+            seen.add(slug)
+            links.append((a.get_text(strip=True), slug))
+    return links
+
+
+def gamelog_url(player_slug: str, year: int = SPORTSREF_YEAR) -> str:
+    return f"{BASE_URL}/cbb/players/{player_slug}/gamelog/{year}"
+
+
+def gamelog_path(team_slug: str, player_slug: str, year: int = SPORTSREF_YEAR) -> Path:
+    return OUT_DIR / f"{team_slug}__{player_slug}_{year}.html"
+
+
+def is_fresh(path: Path, max_age_hours: float) -> bool:
+    if not path.exists():
+        return False
+    return time.time() - path.stat().st_mtime < max_age_hours * 3600
+
+
+# -------------------------
+# Main
+# -------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Download player game log pages.")
+    parser.add_argument("--max-age-hours", type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help="re-fetch logs older than this (0 = always)")
+    args = parser.parse_args()
+
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    team_pages = sorted(TEAM_PAGE_DIR.glob(f"*_{SPORTSREF_YEAR}.html"))
+    if not team_pages:
+        print(f"No team pages in {TEAM_PAGE_DIR}; run scrape_sunbelt_2024_25.py first.")
+        return
+
+    with instrument_stage("scrape_gamelogs") as m:
+        targets = []
+        for page in team_pages:
+            team_slug = page.stem.rsplit("_", 1)[0]
+            for name, player_slug in player_links(page):
+                targets.append((team_slug, name, player_slug))
+        m.rows_in = len(targets)
+
+        fetched = 0
+        for team_slug, name, player_slug in targets:
+            path = gamelog_path(team_slug, player_slug)
+            if is_fresh(path, args.max_age_hours):
+                continue
+            print(f"Fetching game log for {name} ({team_slug})")
+            path.write_text(fetch_html(gamelog_url(player_slug)), encoding="utf-8")
+            fetched += 1
+            time.sleep(1.0)  # politeness delay
+        m.rows_out = fetched
+
+    print(f"Fetched {fetched} of {len(targets)} game logs "
+          f"({len(targets) - fetched} fresher than {args.max_age_hours:g}h)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+"""
+Small read-only JSON API over the warehouse for the scouting UI.
+
+Endpoints:
+    GET /health
+    GET /players/<player_id>                  profile row
+    GET /players/<player_id>/comps?k=5        top-k similar players
+    GET /teams/<team_slug>/roster?season=2025 team profiles, by points
+    GET /search?q=jal+wil&season=2025&limit=10 ranked name search
+
+Requests borrow a connection from a fixed pool of read-only (mode=ro)
+connections instead of opening one per request; each connection keeps its
+statement cache warm since every query is a constant, parameterized SQL string.
+The server never writes to the DB: the pipeline and publish_snapshot put it
+in WAL mode so readers never block (or get blocked by) writers.
+
+JSON responses sit in an LRU cache keyed by (version stamp, path + query
+string), which is also cleared whenever the stamp changes. A request that
+overlaps a swap can only store its response under the version it started
+with, which later requests never look up. The stamp is the resolved DB file
+(so a published snapshot swap counts) plus the size/mtime of the DB and its
+-wal file (so in-place rebuilds count too). When the snapshot file itself
+changes, the pool is reopened against the new file.
+
+Bad parameters (non-integer ids, k / limit below 1) get a 400; SQLite errors
+such as a busy DB or a table missing after a rollback get a JSON 500 and are
+never cached. k and limit are capped at MAX_COMPS / MAX_SEARCH_RESULTS.
+
+Usage:
+    python scripts/serve_read_api.py --port 8000
+"""
+import argparse
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+from pathlib import Path
+import queue
+import re
+import sqlite3
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+
+PROFILE_VIEW = "sun_belt_player_profile_2024_25"
+SIM_TABLE = "player_similarity_sun_belt_2024_25"
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_CACHE_SIZE = 2048
+MAX_COMPS = 25
+MAX_SEARCH_RESULTS = 50
+
+PROFILE_SQL = f"""
+SELECT * FROM {PROFILE_VIEW}
+WHERE player_id = ?;
+"""
+
+ROSTER_SQL = f"""
+SELECT * FROM {PROFILE_VIEW}
+WHERE team_slug = ?
+  AND season    = ?
+ORDER BY pts DESC;
+"""
+
+COMPS_SQL = f"""
+SELECT
+    s.rank,
+    s.distance,
+    cp.player_id AS comp_player_id,
+    cp.full_name AS comp_player,
+    ct.team_slug AS comp_team,
+    s.comp_season
+FROM {SIM_TABLE} AS s
+JOIN players AS cp ON cp.player_id = s.comp_player_id
+JOIN teams   AS ct ON ct.team_id   = cp.team_id
+WHERE s.player_id = ?
+ORDER BY s.rank
+LIMIT ?;
+"""
+
+
+# -------------------------
+# Warehouse version + pool
+# -------------------------
+
+def warehouse_version(db_path: Path = DB_PATH) -> tuple:
+    """Changes whenever the live DB file or its contents change."""
+    real = os.path.realpath(db_path)
+    stamp = [real]
+    for path in (real, real + "-wal"):
+        try:
+            st = os.stat(path)
+            stamp.extend([st.st_size, st.st_mtime_ns])
+        except FileNotFoundError:
+            stamp.extend([0, 0])
+    return tuple(stamp)
+
+
+class ConnectionPool:
+    """Fixed-size pool of read-only connections to one DB file."""
+
+    def __init__(self, db_path: Path = DB_PATH, size: int = DEFAULT_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self.lock = threading.Lock()
+        self.real_path = None
+        self.idle = None
+        self.open()
+
+    def _connect(self, real_path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{real_path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=64,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON;")
+        return conn
+
+    def open(self) -> None:
+        """(Re)open all connections against the file DB_PATH currently resolves to."""
+        real_path = os.path.realpath(self.db_path)
+        if not os.path.exists(real_path):
+            raise FileNotFoundError(f"Warehouse DB not found: {self.db_path}")
+        idle = queue.Queue()
+        for _ in range(self.size):
+            idle.put(self._connect(real_path))
+        with self.lock:
+            old, self.idle, self.real_path = self.idle, idle, real_path
+        if old is not None:
+            # Connections still checked out are closed when they're returned.
+            while not old.empty():
+                old.get_nowait().close()
+
+    @contextmanager
+    def connection(self):
+        with self.lock:
+            idle, real_path = self.idle, self.real_path
+        conn = idle.get()
+        try:
+            yield conn
+        finally:
+            with self.lock:
+                current = self.real_path == real_path and self.idle is idle
+            if current:
+                idle.put(conn)
+            else:
+                conn.close()
+
+
+class ResponseCache:
+    """Thread-safe LRU of encoded JSON responses, dropped on version change."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+class Warehouse:
+    """Pool + cache + version tracking shared by all request threads."""
+
+    def __init__(self, db_path: Path = DB_PATH, pool_size: int = DEFAULT_POOL_SIZE,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, pool_size)
+        self.cache = ResponseCache(cache_size)
+        self.version = warehouse_version(db_path)
+        self.version_lock = threading.Lock()
+
+    def check_version(self) -> tuple:
+        version = warehouse_version(self.db_path)
+        if version != self.version:
+            with self.version_lock:
+                if version != self.version:
+                    if version[0] != self.version[0]:
+                        self.pool.open()  # a new snapshot was swapped in
+                    self.cache.clear()
+                    self.version = version
+        return version
+
+    def query(self, sql: str, params: tuple) -> list[dict]:
+        with self.pool.connection() as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def search(self, text: str, limit: int, season: int | None) -> list[dict]:
+        # imported on first use so server startup stays light
+        from init_sunbelt_v0_player_search_index import search_players
+
+        with self.pool.connection() as conn:
+            return search_players(conn, text, limit, season)
+
+
+# -------------------------
+# Routes
+# -------------------------
+
+class NotFound(Exception):
+    pass
+
+
+def int_param(qs: dict, name: str, default: int, maximum: int) -> int:
+    """Positive int query parameter, capped at `maximum`; ValueError (-> 400) otherwise."""
+    value = int(qs.get(name, [str(default)])[0])
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1")
+    return min(value, maximum)
+
+
+def player_profile(wh: Warehouse, player_id: str, qs: dict):
+    rows = wh.query(PROFILE_SQL, (int(player_id),))
+    if not rows:
+        raise NotFound(f"player {player_id} not found")
+    return rows[0]
+
+
+def player_comps(wh: Warehouse, player_id: str, qs: dict):
+    k = int_param(qs, "k", 5, MAX_COMPS)
+    return {"player_id": int(player_id), "comps": wh.query(COMPS_SQL, (int(player_id), k))}
+
+
+def team_roster(wh: Warehouse, team_slug: str, qs: dict):
+    season = int(qs.get("season", ["2025"])[0])
+    rows = wh.query(ROSTER_SQL, (team_slug, season))
+    if not rows:
+        raise NotFound(f"no players for {team_slug} in {season}")
+    return {"team_slug": team_slug, "season": season, "players": rows}
+
+
+def player_search(wh: Warehouse, _: str, qs: dict):
+    text = qs.get("q", [""])[0]
+    limit = int_param(qs, "limit", 10, MAX_SEARCH_RESULTS)
+    season = int(qs["season"][0]) if "season" in qs else None
+    return {"q": text, "results": wh.search(text, limit, season)}
+
+
+ROUTES = (
+    (re.compile(r"^/search()$"), player_search),
+    (re.compile(r"^/players/(\d+)$"), player_profile),
+    (re.compile(r"^/players/(\d+)/comps$"), player_comps),
+    (re.compile(r"^/teams/([a-z0-9-]+)/roster$"), team_roster),
+)
+
+
+class ReadAPIHandler(BaseHTTPRequestHandler):
+    warehouse: Warehouse = None  # set by make_server()
+    protocol_version = "HTTP/1.1"
+    # headers and body go out as separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        wh = self.warehouse
+        try:
+            version = wh.check_version()
+        except (OSError, sqlite3.Error) as e:
+            # e.g. the DB file vanished mid-swap; the next request retries
+            return self.send_json(500, json.dumps({"error": f"database error: {e}"}).encode())
+        parts = urlsplit(self.path)
+
+        if parts.path == "/health":
+            body = {
+                "status": "ok",
+                "db": os.path.basename(version[0]),
+                "cache_entries": len(wh.cache.entries),
+                "cache_hits": wh.cache.hits,
+                "cache_misses": wh.cache.misses,
+            }
+            return self.send_json(200, json.dumps(body).encode())
+
+        key = (version, self.path)
+        cached = wh.cache.get(key)
+        if cached is not None:
+            return self.send_json(*cached)
+
+        for pattern, handler in ROUTES:
+            match = pattern.match(parts.path)
+            if match:
+                break
+        else:
+            return self.send_json(404, b'{"error": "unknown endpoint"}')
+
+        try:
+            payload = handler(wh, match.group(1), parse_qs(parts.query))
+            response = (200, json.dumps(payload).encode())
+        except NotFound as e:
+            response = (404, json.dumps({"error": str(e)}).encode())
+        except ValueError as e:
+            return self.send_json(400, json.dumps({"error": str(e)}).encode())
+        except sqlite3.Error as e:
+            # busy DB, or a table missing after a rollback: report it, don't cache it
+            return self.send_json(500, json.dumps({"error": f"database error: {e}"}).encode())
+
+        wh.cache.put(key, response)
+        self.send_json(*response)
+
+    def send_json(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet under load
+
+
+def make_server(host: str, port: int, warehouse: Warehouse) -> ThreadingHTTPServer:
+    handler = type("BoundReadAPIHandler", (ReadAPIHandler,), {"warehouse": warehouse})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only JSON API over the warehouse.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    args = parser.parse_args()
+
+    warehouse = Warehouse(args.db, args.pool_size, args.cache_size)
+    server = make_server(args.host, args.port, warehouse)
+    print(f"Serving {args.db} on http://{args.host}:{args.port} "
+          f"(pool={args.pool_size}, cache={args.cache_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
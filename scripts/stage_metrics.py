@@ -0,0 +1,190 @@
+"""
+Shared instrumentation for pipeline stages.
+
+Wrap a stage's work in instrument_stage() and it appends one JSON line to
+ncaa-analytics/metrics/stage_metrics.jsonl with wall + CPU time, peak RSS,
+rows in/out and the EXPLAIN QUERY PLAN of any SQL passed to explain():
+
+    with instrument_stage("season_stats") as m:
+        m.explain(conn, POPULATE_SQL, label="populate")
+        ...
+        m.rows_out = n
+
+Plans that loop over an un-indexed table (a SCAN that isn't the outermost
+loop, or an automatic index SQLite had to build on the fly) are printed as
+warnings and recorded under "full_scans", so a missing index shows up on the
+first run.
+"""
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+METRICS_PATH = PROJECT_ROOT / "ncaa-analytics" / "metrics" / "stage_metrics.jsonl"
+
+
+# -------------------------
+# Memory sampling
+# -------------------------
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (0 if it can't be determined)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is a high-water mark: KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakRSS:
+    """Context manager sampling RSS on a background thread; .peak in bytes."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss_bytes())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = current_rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+        return False
+
+
+# -------------------------
+# Query plans
+# -------------------------
+
+def explain_query_plan(
+    conn: sqlite3.Connection, sql: str, params: tuple = ()
+) -> list[tuple[int, int, str]]:
+    """(id, parent, detail) rows of EXPLAIN QUERY PLAN for one statement."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {sql.strip().rstrip(';')}", params)
+    return [(row[0], row[1], row[3]) for row in rows]
+
+
+def find_full_scans(plan: list[tuple[int, int, str]]) -> list[str]:
+    """
+    Plan steps that scan a table inside a loop: an un-indexed SCAN after the
+    first (outermost) one of its query block, any un-indexed SCAN inside a
+    correlated subquery, and any automatic index built for a join. Each CTE,
+    subquery or compound member is its own block, so materializing one and
+    scanning the result is not flagged.
+    """
+    details = {node: detail for node, _, detail in plan}
+    flagged = []
+    blocks_with_scan = set()
+    for _, parent, detail in plan:
+        if "AUTOMATIC" in detail:
+            flagged.append(detail)
+            continue
+        if not detail.startswith("SCAN ") or "INDEX" in detail:
+            continue
+        if detail.startswith(("SCAN CONSTANT ROW", "SCAN SUBQUERY")):
+            continue
+        correlated = details.get(parent, "").startswith("CORRELATED")
+        if correlated or parent in blocks_with_scan:
+            flagged.append(detail)
+        blocks_with_scan.add(parent)
+    return flagged
+
+
+# -------------------------
+# Stage metrics
+# -------------------------
+
+@dataclass
+class StageMetrics:
+    stage: str
+    started_at: str = ""
+    status: str = "ok"
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    query_plans: list[dict] = field(default_factory=list)
+    extra: dict = field(default_factory=dict)
+
+    def explain(
+        self, conn: sqlite3.Connection, sql: str, params: tuple = (), label: str = ""
+    ) -> list[str]:
+        """Record the query plan for `sql`; returns any flagged full scans."""
+        plan = explain_query_plan(conn, sql, params)
+        scans = find_full_scans(plan)
+        self.query_plans.append(
+            {
+                "label": label or sql.strip().splitlines()[0][:60],
+                "plan": [detail for _, _, detail in plan],
+                "full_scans": scans,
+            }
+        )
+        for detail in scans:
+            print(f"  WARNING [{self.stage}/{label}] full scan in query plan: {detail}")
+        return scans
+
+
+def write_metrics(metrics: StageMetrics, path: Path = METRICS_PATH) -> None:
+    """
+    Append one JSON line. Parallel stages share the file, so the line goes out
+    in a single write() on an O_APPEND fd: the kernel positions each write at
+    the end of the file, so concurrent lines never interleave.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = (json.dumps(asdict(metrics)) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        written = os.write(fd, line)
+    finally:
+        os.close(fd)
+    if written != len(line):
+        raise OSError(f"short write to {path}: {written} of {len(line)} bytes")
+
+
+@contextmanager
+def instrument_stage(stage: str, path: Path | None = METRICS_PATH):
+    """
+    Time a stage and append its metrics to `path` (nothing is written when
+    path is None). The metrics line is written even if the stage raises.
+    """
+    metrics = StageMetrics(stage, started_at=datetime.now().isoformat(timespec="seconds"))
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    mem = PeakRSS()
+    try:
+        with mem:
+            yield metrics
+    except BaseException:
+        metrics.status = "error"
+        raise
+    finally:
+        metrics.wall_seconds = round(time.perf_counter() - wall_start, 4)
+        metrics.cpu_seconds = round(time.process_time() - cpu_start, 4)
+        metrics.peak_rss_mb = round(mem.peak / 2**20, 1)
+        if path is not None:
+            write_metrics(metrics, path)
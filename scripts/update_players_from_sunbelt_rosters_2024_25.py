@@ -2,83 +2,223 @@ from pathlib import Path
 import sqlite3
 import pandas as pd
 
+from init_sun_belt_v0_schema import ensure_class_year_column
+from player_name_matching import ALIAS_TABLE, MatchReport, ensure_alias_table, resolve_unmatched
+from stage_metrics import StageMetrics, instrument_stage
+from warehouse_snapshots import connect_writable
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
 ROSTER_CSV = PROJECT_ROOT / "ncaa-analytics" / "data_intermediate" / \
     "sun_belt" / "2024-25" / "sun_belt_2024_25_roster_all_teams.csv"
 
-
-def ensure_class_year_column(conn: sqlite3.Connection):
-    cur = conn.cursor()
-    cur.execute("PRAGMA table_info(players);")
-    cols = [row[1] for row in cur.fetchall()]
-    if "class_year" not in cols:
-        print("Adding players.class_year column ...")
-        cur.execute("ALTER TABLE players ADD COLUMN class_year TEXT;")
-        conn.commit()
-
-
-def main():
+STAGE_TABLE = "roster_stage"
+
+# Resolve staged roster rows to team_id, then player_id by exact name.
+RESOLVE_TEAM_SQL = f"""
+UPDATE {STAGE_TABLE}
+SET team_id = t.team_id
+FROM teams AS t
+WHERE t.team_slug = {STAGE_TABLE}.team_slug;
+"""
+
+RESOLVE_EXACT_SQL = f"""
+UPDATE {STAGE_TABLE}
+SET player_id = p.player_id
+FROM players AS p
+WHERE p.team_id   = {STAGE_TABLE}.team_id
+  AND p.season    = {STAGE_TABLE}.season
+  AND p.full_name = {STAGE_TABLE}.player;
+"""
+
+# Resolve remaining rows through previously accepted name aliases, skipping
+# players another roster row already claimed (two rows must never share a
+# player_id, or which row's values UPDATE_SQL applies is undefined).
+RESOLVE_ALIAS_SQL = f"""
+UPDATE {STAGE_TABLE}
+SET player_id = a.player_id
+FROM {ALIAS_TABLE} AS a
+WHERE {STAGE_TABLE}.player_id IS NULL
+  AND a.alias_name = {STAGE_TABLE}.player
+  AND a.team_id    = {STAGE_TABLE}.team_id
+  AND a.season     = {STAGE_TABLE}.season
+  AND a.player_id NOT IN (
+      SELECT player_id FROM {STAGE_TABLE} WHERE player_id IS NOT NULL
+  );
+"""
+
+# Set-based enrichment: one UPDATE ... FROM join against the staged roster
+# instead of a SELECT + UPDATE round trip per roster row.
+UPDATE_SQL = f"""
+UPDATE players
+SET
+    height_cm  = COALESCE(r.height_cm,  players.height_cm),
+    weight_kg  = COALESCE(r.weight_kg,  players.weight_kg),
+    class_year = COALESCE(r.class_year, players.class_year)
+FROM {STAGE_TABLE} AS r
+WHERE players.player_id = r.player_id;
+"""
+
+# Anti-join: staged roster rows with no matching player.
+UNMATCHED_SQL = f"""
+SELECT r.player, r.team_slug
+FROM {STAGE_TABLE} AS r
+LEFT JOIN players AS p
+  ON p.player_id = r.player_id
+WHERE p.player_id IS NULL
+ORDER BY r.team_slug, r.player;
+"""
+
+
+def load_roster_df() -> pd.DataFrame:
     if not ROSTER_CSV.exists():
         raise FileNotFoundError(f"Roster CSV not found: {ROSTER_CSV}")
 
-    roster_df = pd.read_csv(ROSTER_CSV)
-    # Normalize
+    return normalize_roster(pd.read_csv(ROSTER_CSV))
+
+
+def normalize_roster(roster_df: pd.DataFrame) -> pd.DataFrame:
+    roster_df = roster_df.copy()
     roster_df["player"] = roster_df["player"].astype(str).str.strip()
     roster_df["team_slug"] = roster_df["team_slug"].astype(str).str.strip()
-
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    return roster_df
+
+
+def stage_roster(conn: sqlite3.Connection, roster_df: pd.DataFrame) -> int:
+    """
+    Bulk-load the roster into a TEMP staging table keyed like players
+    (team_slug, season, player). Duplicate roster rows merge in file order:
+    a later row's non-null fields win, its blanks keep the earlier values
+    (the same result as applying each row with COALESCE).
+    """
+    conn.execute(f"DROP TABLE IF EXISTS temp.{STAGE_TABLE};")
+    conn.execute(
+        f"""
+        CREATE TEMP TABLE {STAGE_TABLE} (
+            team_slug  TEXT    NOT NULL,
+            season     INTEGER NOT NULL,
+            player     TEXT    NOT NULL,
+            class_year TEXT,
+            height_cm  INTEGER,
+            weight_kg  INTEGER,
+            team_id    INTEGER,
+            player_id  INTEGER,
+            PRIMARY KEY (team_slug, season, player)
+        );
+        """
+    )
+
+    df = roster_df.copy()
+    if "class_year" not in df.columns:
+        df["class_year"] = None
+    df["class_year"] = df["class_year"].map(
+        lambda v: None if pd.isna(v) else str(v).strip())
+    for col in ("height_cm", "weight_kg"):
+        df[col] = df[col].map(lambda v: None if pd.isna(v) else int(v))
+    df["season"] = df["season"].astype(int)
+
+    rows = df[["team_slug", "season", "player",
+               "class_year", "height_cm", "weight_kg"]].itertuples(index=False, name=None)
+    conn.executemany(
+        f"""
+        INSERT INTO {STAGE_TABLE}
+            (team_slug, season, player, class_year, height_cm, weight_kg)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (team_slug, season, player) DO UPDATE SET
+            class_year = COALESCE(excluded.class_year, class_year),
+            height_cm  = COALESCE(excluded.height_cm,  height_cm),
+            weight_kg  = COALESCE(excluded.weight_kg,  weight_kg);
+        """,
+        rows,
+    )
+
+    return conn.execute(f"SELECT COUNT(*) FROM {STAGE_TABLE};").fetchone()[0]
+
+
+def explain_roster_sql(conn: sqlite3.Connection, metrics: StageMetrics) -> None:
+    """Record query plans for the staged-roster statements (stage must exist)."""
+    for label, sql in (
+        ("resolve_team", RESOLVE_TEAM_SQL),
+        ("resolve_exact", RESOLVE_EXACT_SQL),
+        ("resolve_alias", RESOLVE_ALIAS_SQL),
+        ("update_players", UPDATE_SQL),
+        ("unmatched", UNMATCHED_SQL),
+    ):
+        metrics.explain(conn, sql, label=label)
+
+
+def resolve_players(conn: sqlite3.Connection, fuzzy: bool = True) -> MatchReport:
+    """
+    Fill roster_stage.player_id: exact name join first, then the alias table,
+    then (optionally) the blocked fuzzy matcher for whatever is left. Prints
+    and returns the match report for the whole roster.
+    """
+    conn.execute(RESOLVE_TEAM_SQL)
+    exact = conn.execute(RESOLVE_EXACT_SQL).rowcount
+    alias = conn.execute(RESOLVE_ALIAS_SQL).rowcount
+
+    unmatched = []
+    if fuzzy:
+        unmatched = conn.execute(
+            f"""
+            SELECT player, team_id, season
+            FROM {STAGE_TABLE}
+            WHERE player_id IS NULL
+              AND team_id IS NOT NULL;
+            """
+        ).fetchall()
+    if unmatched:
+        report = resolve_unmatched(conn, unmatched, stage_table=STAGE_TABLE)
+        conn.execute(RESOLVE_ALIAS_SQL)
+    else:
+        report = MatchReport()
+
+    report.roster_total = conn.execute(
+        f"SELECT COUNT(*) FROM {STAGE_TABLE};").fetchone()[0]
+    report.exact, report.alias = exact, alias
+    report.print_summary()
+    return report
+
+
+def apply_roster(
+    conn: sqlite3.Connection,
+    roster_df: pd.DataFrame,
+    fuzzy: bool = True,
+    metrics: StageMetrics | None = None,
+) -> tuple[int, list[tuple[str, str]]]:
+    """
+    Stage the roster, resolve it to player_ids and apply it to players in one
+    statement. Returns (updated_row_count, [(player, team_slug), ...] unmatched).
+    With `metrics`, query plans of the set-based statements are recorded.
+    """
     ensure_class_year_column(conn)
-    cur = conn.cursor()
+    ensure_alias_table(conn)
+    with conn:
+        stage_roster(conn, roster_df)
+        if metrics is not None:
+            explain_roster_sql(conn, metrics)
+        report = resolve_players(conn, fuzzy=fuzzy)
+        if metrics is not None:
+            metrics.extra["match_rate"] = round(report.roster_match_rate, 4)
+        updated = conn.execute(UPDATE_SQL).rowcount
+        missing = conn.execute(UNMATCHED_SQL).fetchall()
+        conn.execute(f"DROP TABLE IF EXISTS temp.{STAGE_TABLE};")
+    return updated, missing
 
-    updated = 0
-    missing = []
 
-    for row in roster_df.itertuples(index=False):
-        team_slug = row.team_slug
-        season = int(row.season)
-        player_name = row.player.strip()
-
-        height_cm = None if pd.isna(row.height_cm) else int(row.height_cm)
-        weight_kg = None if pd.isna(row.weight_kg) else int(row.weight_kg)
-        class_year = None if pd.isna(
-            row.class_year) else str(row.class_year).strip()
+def main():
+    roster_df = load_roster_df()
 
-        # Find matching player_id
-        cur.execute(
-            """
-            SELECT p.player_id
-            FROM players p
-            JOIN teams t ON t.team_id = p.team_id
-            WHERE p.season = ?
-              AND t.team_slug = ?
-              AND p.full_name = ?
-            """,
-            (season, team_slug, player_name),
-        )
-        res = cur.fetchone()
-        if not res:
-            missing.append((player_name, team_slug))
-            continue
-
-        player_id = res[0]
-
-        cur.execute(
-            """
-            UPDATE players
-            SET
-                height_cm = COALESCE(?, height_cm),
-                weight_kg = COALESCE(?, weight_kg),
-                class_year = COALESCE(?, class_year)
-            WHERE player_id = ?;
-            """,
-            (height_cm, weight_kg, class_year, player_id),
-        )
-        updated += 1
-
-    conn.commit()
-    conn.close()
+    conn = connect_writable(DB_PATH)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    try:
+        with instrument_stage("roster_update") as m:
+            m.rows_in = len(roster_df)
+            updated, missing = apply_roster(conn, roster_df, metrics=m)
+            m.rows_out = updated
+            m.extra["unmatched"] = len(missing)
+    finally:
+        conn.close()
 
     print(f"Updated {updated} player rows.")
     if missing:
@@ -0,0 +1,500 @@
+"""
+Export warehouse datasets for reporting as compressed, partitioned files.
+
+Datasets:
+
+* profiles: sun_belt_player_profile_2024_25 plus the team's conference
+* comps:    player_similarity_sun_belt_2024_25 with player / comp names
+
+Each dataset is streamed out of SQLite with fetchmany() in batches of
+--batch-rows, so memory stays flat regardless of table size. Files are
+partitioned Hive-style by season and conference:
+
+    ncaa-analytics/exports/{dataset}/season=2025/conference=Sun%20Belt/part-0.parquet
+    ncaa-analytics/exports/{dataset}/manifest.json
+
+Files are Parquet (zstd), typed from each column's SQLite affinity; columns
+without a declared type (view expressions) are typed from the values seen.
+--format csv.gz writes gzip CSV instead. The manifest records the columns,
+and for every partition its row count, a SHA-256 of the source rows and a
+SHA-256 of the file.
+
+Re-exports are incremental. Published snapshots never change, so when the
+DB is one and the manifest was written from the same snapshot version (and
+dataset definition), the export is skipped without running any query.
+Otherwise a first streaming pass hashes each partition's rows. Only
+partitions whose hash differs from the manifest (or whose file is missing)
+are queried again and rewritten, and partitions that no longer exist are
+removed.
+
+Usage:
+    python scripts/warehouse_export.py                       # all datasets
+    python scripts/warehouse_export.py --dataset comps --format csv.gz
+    python scripts/warehouse_export.py --force               # rewrite everything
+
+From a notebook:
+    from warehouse_export import read_export
+    df = read_export("profiles", season=2025)
+"""
+import argparse
+import csv
+from dataclasses import dataclass
+from datetime import datetime
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import os
+from pathlib import Path
+import sqlite3
+from urllib.parse import quote
+
+from stage_metrics import StageMetrics, instrument_stage
+from warehouse_snapshots import (
+    active_db_path, atomic_write_text, published_version, snapshot_path,
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+EXPORT_DIR = PROJECT_ROOT / "ncaa-analytics" / "exports"
+
+BATCH_ROWS = 10_000
+FORMATS = ("parquet", "csv.gz")
+PARTITION_COLUMNS = ("season", "conference")
+
+
+@dataclass(frozen=True)
+class Dataset:
+    name: str
+    # SELECT ... FROM ... JOINs, without WHERE / ORDER BY
+    select_sql: str
+    # SQL expressions for (season, conference), used to filter one partition
+    partition_exprs: tuple[str, str]
+    # row order within a partition
+    order_by: str
+
+
+DATASETS = {
+    "profiles": Dataset(
+        name="profiles",
+        select_sql="""
+            SELECT v.*, t.conference
+            FROM sun_belt_player_profile_2024_25 AS v
+            JOIN teams AS t ON t.team_slug = v.team_slug
+        """,
+        partition_exprs=("v.season", "t.conference"),
+        order_by="v.player_id",
+    ),
+    "comps": Dataset(
+        name="comps",
+        select_sql="""
+            SELECT s.player_id, p.full_name, t.team_slug,
+                   s.season, t.conference,
+                   s.rank, s.comp_player_id, cp.full_name AS comp_full_name,
+                   ct.team_slug AS comp_team_slug, s.comp_season, s.distance
+            FROM player_similarity_sun_belt_2024_25 AS s
+            JOIN players AS p  ON p.player_id  = s.player_id
+            JOIN teams   AS t  ON t.team_id    = p.team_id
+            JOIN players AS cp ON cp.player_id = s.comp_player_id
+            JOIN teams   AS ct ON ct.team_id   = cp.team_id
+        """,
+        partition_exprs=("s.season", "t.conference"),
+        order_by="s.player_id, s.rank",
+    ),
+}
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def require_pyarrow() -> None:
+    if importlib.util.find_spec("pyarrow") is None:
+        raise RuntimeError(
+            "Parquet export needs pyarrow (pip install -r requirements.txt), "
+            "or pass --format csv.gz")
+
+
+def partition_dir(season, conference) -> str:
+    return f"season={quote(str(season), safe='')}/conference={quote(str(conference), safe='')}"
+
+
+def manifest_file(out_dir: Path, dataset: str) -> Path:
+    return out_dir / dataset / "manifest.json"
+
+
+def read_manifest(out_dir: Path, dataset: str) -> dict:
+    path = manifest_file(out_dir, dataset)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def definition_sha256(ds: Dataset, fmt: str) -> str:
+    spec = [ds.select_sql, *ds.partition_exprs, ds.order_by, fmt]
+    return hashlib.sha256(json.dumps(spec).encode()).hexdigest()
+
+
+def unchanged_since(manifest: dict, out_dir: Path, ds: Dataset, fmt: str,
+                    source_version: str | None) -> bool:
+    """True if `manifest` was written from this snapshot version and its files are intact."""
+    if source_version is None or manifest.get("source_version") != source_version:
+        return False
+    if manifest.get("definition_sha256") != definition_sha256(ds, fmt):
+        return False
+    for part in manifest.get("partitions", []):
+        path = out_dir / ds.name / part["path"]
+        if not path.exists() or path.stat().st_size != part["bytes"]:
+            return False
+    return True
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def column_types(conn: sqlite3.Connection, ds: Dataset) -> list[tuple[str, str]]:
+    """(name, declared SQLite type) for each output column, via a TEMP view."""
+    view = f"export_{ds.name}"
+    conn.execute(f"DROP VIEW IF EXISTS temp.{view};")
+    conn.execute(f"CREATE TEMP VIEW {view} AS {ds.select_sql};")
+    try:
+        info = conn.execute(f"PRAGMA temp.table_info({view});").fetchall()
+    finally:
+        conn.execute(f"DROP VIEW IF EXISTS temp.{view};")
+    return [(row[1], (row[2] or "").upper()) for row in info]
+
+
+def stream(conn: sqlite3.Connection, sql: str, params=(), batch_rows: int = BATCH_ROWS):
+    cur = conn.execute(sql, params)
+    while True:
+        rows = cur.fetchmany(batch_rows)
+        if not rows:
+            break
+        yield rows
+
+
+# -------------------------
+# Writers
+# -------------------------
+
+# Storage classes seen in an untyped column -> the type to export it as
+OBSERVED_TYPES = (
+    ({"int"}, "INTEGER"),
+    ({"int", "float"}, "REAL"),
+    ({"bytes"}, "BLOB"),
+)
+
+
+def has_affinity(decl: str) -> bool:
+    """False for columns with no declared type (BLOB affinity), e.g. view expressions."""
+    return decl not in ("", "BLOB")
+
+
+def resolve_types(
+    columns: list[tuple[str, str]], observed: dict[str, set[str]]
+) -> list[tuple[str, str]]:
+    """Fill in untyped columns from the Python types of their non-NULL values."""
+    resolved = []
+    for name, decl in columns:
+        if not has_affinity(decl):
+            seen = observed.get(name, set())
+            decl = next((t for kinds, t in OBSERVED_TYPES if seen and seen <= kinds), "TEXT")
+        resolved.append((name, decl))
+    return resolved
+
+
+def _arrow_schema(columns: list[tuple[str, str]]):
+    import pyarrow as pa
+
+    # SQLite affinity rules, in SQLite's order of precedence
+    def arrow_type(decl: str):
+        if "INT" in decl:
+            return pa.int64()
+        if any(t in decl for t in ("CHAR", "CLOB", "TEXT")):
+            return pa.string()
+        if decl == "BLOB":
+            return pa.binary()
+        return pa.float64()  # REAL and NUMERIC affinity
+
+    return pa.schema([(name, arrow_type(decl)) for name, decl in columns])
+
+
+def write_partition(path: Path, fmt: str, columns: list[tuple[str, str]], batches) -> int:
+    """Write row batches to `path` (via a temp file + rename). Returns rows written."""
+    tmp = path.with_name(path.name + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    names = [name for name, _ in columns]
+    rows_written = 0
+
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _arrow_schema(columns)
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            for rows in batches:
+                arrays = [pa.array(values, type=field.type)
+                          for values, field in zip(zip(*rows), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                rows_written += len(rows)
+    else:
+        # mtime=0 keeps the file hash stable for identical rows
+        with gzip.GzipFile(tmp, mode="wb", mtime=0) as gz, \
+                io.TextIOWrapper(gz, encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            for rows in batches:
+                writer.writerows(rows)
+                rows_written += len(rows)
+
+    os.replace(tmp, path)
+    return rows_written
+
+
+# -------------------------
+# Export
+# -------------------------
+
+def partition_hashes(
+    conn: sqlite3.Connection,
+    ds: Dataset,
+    columns: list[tuple[str, str]],
+    fmt: str,
+    batch_rows: int = BATCH_ROWS,
+) -> tuple[dict[tuple, tuple[int, str]], dict[str, set[str]]]:
+    """
+    Stream the whole dataset once, ordered by partition, and return
+    {(season, conference): (rows, sha256 of the rows)} plus the Python types
+    seen in each untyped column. The column list and format are hashed too,
+    so a schema or format change rewrites everything.
+    """
+    names = [name for name, _ in columns]
+    untyped = [i for i, (_, decl) in enumerate(columns) if not has_affinity(decl)]
+    observed = {names[i]: set() for i in untyped}
+    key_idx = [names.index(c) for c in PARTITION_COLUMNS]
+    header = json.dumps({"columns": columns, "format": fmt}).encode()
+    season_expr, conference_expr = ds.partition_exprs
+    sql = f"{ds.select_sql} ORDER BY {season_expr}, {conference_expr}, {ds.order_by};"
+
+    counts, hashes = {}, {}
+    key = h = None
+    for rows in stream(conn, sql, batch_rows=batch_rows):
+        for row in rows:
+            row_key = tuple(row[i] for i in key_idx)
+            if row_key != key:
+                key, h = row_key, hashlib.sha256(header)
+                counts[key], hashes[key] = 0, h
+            counts[key] += 1
+            h.update(repr(row).encode())
+            for i in untyped:
+                if row[i] is not None:
+                    observed[names[i]].add(type(row[i]).__name__)
+    return {k: (counts[k], hashes[k].hexdigest()) for k in counts}, observed
+
+
+def _remove_partition(dataset_dir: Path, rel_path: str) -> None:
+    path = dataset_dir / rel_path
+    path.unlink(missing_ok=True)
+    # drop now-empty conference=/season= directories
+    for parent in (path.parent, path.parent.parent):
+        if parent != dataset_dir and parent.exists() and not any(parent.iterdir()):
+            parent.rmdir()
+
+
+def export_dataset(
+    conn: sqlite3.Connection,
+    ds: Dataset,
+    fmt: str,
+    out_dir: Path = EXPORT_DIR,
+    force: bool = False,
+    batch_rows: int = BATCH_ROWS,
+    metrics: StageMetrics | None = None,
+    source_version: str | None = None,
+) -> dict:
+    """
+    Export one dataset, rewriting only changed partitions, and write its
+    manifest. Returns {"rows", "written", "skipped", "removed"} counts.
+    `source_version` is the published snapshot `conn` reads, if any.
+    """
+    dataset_dir = out_dir / ds.name
+    manifest = read_manifest(out_dir, ds.name)
+    if not force and unchanged_since(manifest, out_dir, ds, fmt, source_version):
+        return {"rows": manifest["rows"], "written": 0,
+                "skipped": len(manifest["partitions"]), "removed": 0}
+
+    columns = column_types(conn, ds)
+    previous = {
+        (p["season"], p["conference"]): p
+        for p in manifest.get("partitions", [])
+    }
+    if metrics is not None:
+        metrics.explain(conn, f"{ds.select_sql} ORDER BY {', '.join(ds.partition_exprs)}, "
+                        f"{ds.order_by};", label=f"export_{ds.name}")
+
+    current, observed = partition_hashes(conn, ds, columns, fmt, batch_rows)
+    columns = resolve_types(columns, observed)
+
+    season_expr, conference_expr = ds.partition_exprs
+    partition_sql = (f"{ds.select_sql} WHERE {season_expr} = ? AND {conference_expr} = ? "
+                     f"ORDER BY {ds.order_by};")
+    entries = []
+    written = skipped = 0
+    for (season, conference), (n_rows, source_hash) in sorted(current.items()):
+        rel_path = f"{partition_dir(season, conference)}/part-0.{fmt}"
+        path = dataset_dir / rel_path
+        old = previous.get((season, conference))
+        if (not force and old is not None and old["source_sha256"] == source_hash
+                and old["path"] == rel_path and path.exists()
+                and path.stat().st_size == old["bytes"]):
+            entries.append(old)
+            skipped += 1
+            continue
+
+        if old is not None and old["path"] != rel_path:
+            _remove_partition(dataset_dir, old["path"])
+        rows_written = write_partition(
+            path, fmt, columns, stream(conn, partition_sql, (season, conference), batch_rows))
+        if rows_written != n_rows:
+            raise RuntimeError(
+                f"{ds.name} {rel_path}: wrote {rows_written} rows, expected {n_rows} "
+                "(source changed during export?)")
+        entries.append({
+            "season": season,
+            "conference": conference,
+            "path": rel_path,
+            "rows": n_rows,
+            "bytes": path.stat().st_size,
+            "source_sha256": source_hash,
+            "file_sha256": sha256_file(path),
+        })
+        written += 1
+
+    removed = previous.keys() - current.keys()
+    for key in removed:
+        _remove_partition(dataset_dir, previous[key]["path"])
+
+    dataset_dir.mkdir(parents=True, exist_ok=True)
+    total_rows = sum(e["rows"] for e in entries)
+    atomic_write_text(
+        manifest_file(out_dir, ds.name),
+        json.dumps(
+            {
+                "dataset": ds.name,
+                "format": fmt,
+                "source_version": source_version,
+                "definition_sha256": definition_sha256(ds, fmt),
+                "exported_at": datetime.now().isoformat(timespec="seconds"),
+                "columns": [{"name": n, "type": t} for n, t in columns],
+                "partition_by": list(PARTITION_COLUMNS),
+                "rows": total_rows,
+                "partitions": entries,
+            },
+            indent=2,
+        ),
+    )
+    return {"rows": total_rows, "written": written, "skipped": skipped,
+            "removed": len(removed)}
+
+
+def export_datasets(
+    conn: sqlite3.Connection,
+    names: list[str] | None = None,
+    fmt: str = "parquet",
+    out_dir: Path = EXPORT_DIR,
+    force: bool = False,
+    batch_rows: int = BATCH_ROWS,
+    metrics: StageMetrics | None = None,
+    source_version: str | None = None,
+) -> dict[str, dict]:
+    """Export each named dataset (default: all). Returns {dataset: counts}."""
+    if fmt == "parquet":
+        require_pyarrow()
+    results = {}
+    for name in names or DATASETS:
+        results[name] = export_dataset(
+            conn, DATASETS[name], fmt, out_dir, force, batch_rows, metrics,
+            source_version)
+    if metrics is not None:
+        metrics.rows_out = sum(r["rows"] for r in results.values())
+        metrics.extra["format"] = fmt
+        metrics.extra["partitions_written"] = sum(r["written"] for r in results.values())
+        metrics.extra["partitions_skipped"] = sum(r["skipped"] for r in results.values())
+    return results
+
+
+def read_export(
+    dataset: str, season: int | None = None, conference: str | None = None,
+    out_dir: Path = EXPORT_DIR,
+):
+    """Load an exported dataset (optionally one season / conference) as a DataFrame."""
+    import pandas as pd
+
+    manifest = read_manifest(out_dir, dataset)
+    if not manifest:
+        raise FileNotFoundError(f"No export manifest for {dataset!r} in {out_dir}")
+    frames = []
+    for part in manifest["partitions"]:
+        if season is not None and part["season"] != season:
+            continue
+        if conference is not None and part["conference"] != conference:
+            continue
+        path = out_dir / dataset / part["path"]
+        if manifest["format"] == "parquet":
+            frames.append(pd.read_parquet(path))
+        else:
+            frames.append(pd.read_csv(path))
+    columns = [c["name"] for c in manifest["columns"]]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export profiles and comps as partitioned files.")
+    parser.add_argument("--dataset", action="append", choices=sorted(DATASETS),
+                        help="dataset to export (repeatable; default: all)")
+    parser.add_argument("--format", choices=FORMATS, default="parquet",
+                        help="file format (default: parquet, which needs pyarrow)")
+    parser.add_argument("--out-dir", type=Path, default=EXPORT_DIR)
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS,
+                        help="rows fetched from SQLite per batch")
+    parser.add_argument("--force", action="store_true",
+                        help="rewrite every partition even if unchanged")
+    args = parser.parse_args()
+
+    if args.format == "parquet":
+        try:
+            require_pyarrow()
+        except RuntimeError as e:
+            parser.error(str(e))
+    db_path = active_db_path(DB_PATH)
+    if not db_path.exists():
+        parser.error(f"Warehouse DB not found: {db_path}")
+
+    # read the snapshot file itself, so a swap mid-export can't mix versions
+    version = published_version(db_path)
+    if version is not None:
+        db_path = snapshot_path(version)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        with instrument_stage("export") as m:
+            results = export_datasets(
+                conn, args.dataset, args.format, args.out_dir, args.force,
+                args.batch_rows, metrics=m, source_version=version)
+    finally:
+        conn.close()
+
+    for name, r in results.items():
+        print(f"{name:<9} {r['rows']:>8} rows  {r['written']} partitions written, "
+              f"{r['skipped']} unchanged, {r['removed']} removed "
+              f"-> {args.out_dir / name}")
+
+
+if __name__ == "__main__":
+    main()
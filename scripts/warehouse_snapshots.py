@@ -0,0 +1,331 @@
+"""
+Versioned warehouse snapshots with an atomic "current" swap.
+
+A publish copies a finished database into
+ncaa-analytics/db/snapshots/ncaa_dev_<version>.db, validates it, and only then
+points readers at it:
+
+* snapshots/CURRENT holds the file name of the live snapshot, and
+* ncaa-analytics/db/ncaa_dev.db becomes a symlink to that snapshot.
+
+Both are swapped with os.replace(), so a reader opening ncaa_dev.db sees the
+old snapshot or the new one, never a half-built DB, and readers that already
+have the old file open keep reading it undisturbed. The last KEEP_SNAPSHOTS
+snapshots stay on disk for instant rollback.
+
+Incremental pipeline runs never write into the live snapshot: the runner
+copies it to STAGING_PATH, points step scripts there through the STAGING_ENV
+environment variable, and publishes the copy once every stage has finished.
+
+Usage:
+    python scripts/warehouse_snapshots.py list
+    python scripts/warehouse_snapshots.py rollback [--to VERSION]
+"""
+import argparse
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import shutil
+import sqlite3
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = PROJECT_ROOT / "ncaa-analytics" / "db" / "ncaa_dev.db"
+SNAPSHOT_DIR = DB_PATH.parent / "snapshots"
+CURRENT_POINTER = SNAPSHOT_DIR / "CURRENT"
+STAGING_PATH = DB_PATH.with_name("ncaa_dev.staging.db")
+# Set by the pipeline runner while its step scripts write to STAGING_PATH.
+STAGING_ENV = "NCAA_STAGING_DB"
+
+KEEP_SNAPSHOTS = 5
+
+# A new snapshot may not shrink any of these below this share of the current one.
+MIN_ROW_RATIO = 0.9
+
+REQUIRED_RELATIONS = (
+    "player_per_game_sun_belt_2024_25",
+    "teams",
+    "players",
+    "player_season_stats",
+    "team_season_stats",
+    "player_similarity_sun_belt_2024_25",
+    "sun_belt_player_profile_2024_25",
+)
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def snapshot_path(version: str) -> Path:
+    return SNAPSHOT_DIR / f"ncaa_dev_{version}.db"
+
+
+def manifest_path(version: str) -> Path:
+    return SNAPSHOT_DIR / f"ncaa_dev_{version}.json"
+
+
+def list_versions() -> list[str]:
+    """Published snapshot versions, oldest first."""
+    if not SNAPSHOT_DIR.exists():
+        return []
+    return sorted(
+        p.stem.removeprefix("ncaa_dev_") for p in SNAPSHOT_DIR.glob("ncaa_dev_*.db")
+    )
+
+
+def current_version() -> str | None:
+    if not CURRENT_POINTER.exists():
+        return None
+    name = CURRENT_POINTER.read_text(encoding="utf-8").strip()
+    return Path(name).stem.removeprefix("ncaa_dev_") or None
+
+
+def is_published(db_path: Path = DB_PATH) -> bool:
+    """True when db_path is the symlink publish_snapshot points at a snapshot."""
+    if not db_path.is_symlink():
+        return False
+    return Path(os.path.realpath(db_path)).parent == SNAPSHOT_DIR.resolve()
+
+
+def published_version(db_path: Path = DB_PATH) -> str | None:
+    """Version of the snapshot db_path points at, or None if it isn't published."""
+    if not is_published(db_path):
+        return None
+    return Path(os.path.realpath(db_path)).stem.removeprefix("ncaa_dev_")
+
+
+def check_writable(db_path: Path = DB_PATH) -> None:
+    """
+    Raise if writing to db_path would modify a published snapshot in place,
+    under readers and behind its validated manifest.
+    """
+    if is_published(db_path):
+        raise RuntimeError(
+            f"{db_path.name} points at a published snapshot; run the step through "
+            "run_sunbelt_2024_25_pipeline.py, which stages a copy and publishes it")
+
+
+def active_db_path(db_path: Path = DB_PATH) -> Path:
+    """The DB a step script should use: the runner's staging copy, if any, else db_path."""
+    staging = os.environ.get(STAGING_ENV)
+    return Path(staging) if staging else db_path
+
+
+def connect_writable(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """Open the warehouse for a step script's writes; exits if it's a published snapshot."""
+    db_path = active_db_path(db_path)
+    try:
+        check_writable(db_path)
+    except RuntimeError as e:
+        sys.exit(str(e))
+    return sqlite3.connect(db_path)
+
+
+def read_manifest(version: str) -> dict:
+    path = manifest_path(version)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# -------------------------
+# Validation
+# -------------------------
+
+def collect_row_counts(conn: sqlite3.Connection) -> dict[str, int]:
+    existing = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view');")
+    }
+    counts = {}
+    for name in REQUIRED_RELATIONS:
+        if name in existing:
+            counts[name] = conn.execute(f"SELECT COUNT(*) FROM {name};").fetchone()[0]
+    return counts
+
+
+def validate_snapshot(conn: sqlite3.Connection, previous_counts: dict[str, int]) -> dict[str, int]:
+    """
+    Check integrity, foreign keys and row counts. Returns the row counts;
+    raises ValueError describing every failed check.
+    """
+    problems = []
+
+    integrity = conn.execute("PRAGMA quick_check;").fetchone()[0]
+    if integrity != "ok":
+        problems.append(f"quick_check: {integrity}")
+
+    fk_violations = conn.execute("PRAGMA foreign_key_check;").fetchall()
+    if fk_violations:
+        problems.append(f"{len(fk_violations)} foreign key violations")
+
+    counts = collect_row_counts(conn)
+    for name in REQUIRED_RELATIONS:
+        if name not in counts:
+            problems.append(f"missing {name}")
+        elif counts[name] == 0:
+            problems.append(f"{name} is empty")
+        elif name in previous_counts:
+            floor = int(previous_counts[name] * MIN_ROW_RATIO)
+            if counts[name] < floor:
+                problems.append(
+                    f"{name} shrank from {previous_counts[name]} to {counts[name]} rows")
+
+    if problems:
+        raise ValueError("Snapshot failed validation: " + "; ".join(problems))
+    return counts
+
+
+# -------------------------
+# Publish / swap / rollback
+# -------------------------
+
+def point_current_at(version: str) -> None:
+    """Atomically make `version` the live snapshot (pointer file + DB symlink)."""
+    target = snapshot_path(version)
+    if not target.exists():
+        raise FileNotFoundError(f"Snapshot not found: {target}")
+
+    atomic_write_text(CURRENT_POINTER, target.name + "\n")
+
+    tmp_link = DB_PATH.with_name(DB_PATH.name + ".swap")
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    try:
+        os.symlink(os.path.relpath(target, DB_PATH.parent), tmp_link)
+    except OSError:
+        # No symlink support (e.g. Windows without developer mode): fall back
+        # to an atomic rename of a full copy. Fold the WAL into the main file
+        # first, or the copy would miss any commits still sitting in -wal.
+        conn = sqlite3.connect(target)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        finally:
+            conn.close()
+        shutil.copyfile(target, tmp_link)
+    os.replace(tmp_link, DB_PATH)
+
+
+def check_keep(keep: int) -> None:
+    if keep < 1:
+        raise ValueError(f"keep must be at least 1 (the live snapshot), got {keep}")
+
+
+def remove_db(path: Path) -> None:
+    for p in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+        p.unlink(missing_ok=True)
+
+
+def start_staging(staging: Path = STAGING_PATH) -> Path:
+    """Copy the live snapshot to `staging` (backup API) for a run to write into."""
+    remove_db(staging)
+    src = sqlite3.connect(f"file:{os.path.realpath(DB_PATH)}?mode=ro", uri=True)
+    dst = sqlite3.connect(staging)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+    return staging
+
+
+def prune_snapshots(keep: int = KEEP_SNAPSHOTS) -> list[str]:
+    """Delete all but the newest `keep` snapshots (never the live one)."""
+    check_keep(keep)
+    live = current_version()
+    versions = list_versions()
+    doomed = [v for v in versions[:-keep] if v != live]
+    for version in doomed:
+        remove_db(snapshot_path(version))
+        manifest_path(version).unlink(missing_ok=True)
+    return doomed
+
+
+def publish_snapshot(src: sqlite3.Connection, keep: int = KEEP_SNAPSHOTS) -> str:
+    """
+    Copy `src` into a new versioned snapshot, validate it against the current
+    snapshot's manifest and swap it in. Returns the new version.
+    """
+    check_keep(keep)
+    SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    building = snapshot_path(version).with_suffix(".db.building")
+
+    live = current_version()
+    previous_counts = read_manifest(live).get("row_counts", {}) if live else {}
+
+    dst = sqlite3.connect(building)
+    try:
+        src.backup(dst)
+        counts = validate_snapshot(dst, previous_counts)
+        # readers (serve_read_api) open snapshots read-only and rely on WAL
+        dst.execute("PRAGMA journal_mode=WAL;")
+    except Exception:
+        dst.close()
+        building.unlink(missing_ok=True)
+        raise
+    dst.close()
+
+    os.replace(building, snapshot_path(version))
+    atomic_write_text(
+        manifest_path(version),
+        json.dumps(
+            {
+                "version": version,
+                "published_at": datetime.now().isoformat(timespec="seconds"),
+                "previous_version": live,
+                "row_counts": counts,
+            },
+            indent=2,
+        ),
+    )
+    point_current_at(version)
+    prune_snapshots(keep)
+    return version
+
+
+def rollback(to_version: str | None = None) -> str:
+    """Point readers at `to_version`, or at the snapshot before the live one."""
+    versions = list_versions()
+    if to_version is None:
+        live = current_version()
+        older = [v for v in versions if live is None or v < live]
+        if not older:
+            raise ValueError("No older snapshot to roll back to.")
+        to_version = older[-1]
+    elif to_version not in versions:
+        raise ValueError(f"Unknown snapshot version: {to_version}")
+
+    point_current_at(to_version)
+    return to_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage published warehouse snapshots.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="list snapshots, marking the live one")
+    rb = sub.add_parser("rollback", help="point readers at an older snapshot")
+    rb.add_argument("--to", dest="version", help="snapshot version (default: previous)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        live = current_version()
+        for version in list_versions():
+            counts = read_manifest(version).get("row_counts", {})
+            marker = "*" if version == live else " "
+            print(f"{marker} {version}  players={counts.get('players', '?')}")
+    elif args.command == "rollback":
+        version = rollback(args.version)
+        print(f"Rolled back: {DB_PATH.name} -> {snapshot_path(version).name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Shared fixtures: a small synthetic warehouse built with the benchmark's
+stage functions (generate_synthetic_sportsref.py + benchmark_pipeline.py),
+so tests run offline and never touch ncaa-analytics/.
+"""
+from pathlib import Path
+import shutil
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from benchmark_pipeline import run_stages  # noqa: E402
+from generate_synthetic_sportsref import generate  # noqa: E402
+from init_sunbelt_v0_player_profile_view import create_profile_view  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def raw_dir(tmp_path_factory) -> Path:
+    out = tmp_path_factory.mktemp("data_raw")
+    generate(out, n_teams=4, n_players=8, seed=7, n_games=12)
+    return out
+
+
+@pytest.fixture(scope="session")
+def built_db(tmp_path_factory, raw_dir) -> Path:
+    db_path = tmp_path_factory.mktemp("built") / "ncaa_dev.db"
+    run_stages(raw_dir, db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        create_profile_view(conn)
+    finally:
+        conn.close()
+    return db_path
+
+
+@pytest.fixture
+def warehouse(tmp_path, built_db) -> sqlite3.Connection:
+    """A fresh, writable copy of the synthetic warehouse for one test."""
+    db_path = tmp_path / "warehouse.db"
+    shutil.copyfile(built_db, db_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    yield conn
+    conn.close()
@@ -0,0 +1,61 @@
+import shutil
+import sqlite3
+
+import pytest
+
+import init_sunbelt_v0_game_logs as game_logs
+from parse_sportsref_sunbelt_2024_25_gamelogs import parse_all_gamelogs
+
+
+@pytest.fixture(scope="module")
+def games(raw_dir):
+    return parse_all_gamelogs(raw_dir=raw_dir / "gamelogs", pattern="*.html")
+
+
+def snapshot(conn):
+    """(game log rows, rolling rows), in a stable order."""
+    return tuple(
+        conn.execute(f"SELECT * FROM {name} ORDER BY player_id, game_date;").fetchall()
+        for name in (game_logs.GAME_LOG_TABLE, game_logs.ROLLING_TABLE)
+    )
+
+
+def full_recompute(built_db, tmp_path, games):
+    """Load `games` in one go into a fresh copy of the warehouse."""
+    db_path = tmp_path / "full.db"
+    shutil.copyfile(built_db, db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        game_logs.apply_game_logs(conn, games)
+        return snapshot(conn)
+    finally:
+        conn.close()
+
+
+def test_incremental_refresh_matches_full_recompute(warehouse, built_db, tmp_path, games):
+    latest = games.groupby(["team_slug", "player"])["game_date"].transform("max")
+    game_logs.apply_game_logs(warehouse, games[games["game_date"] < latest])
+    written, refreshed, missing = game_logs.apply_game_logs(warehouse, games)
+
+    players = games.groupby(["team_slug", "player"]).ngroups
+    assert written == players  # only each player's new last game
+    assert refreshed == players
+    assert missing == []
+    assert snapshot(warehouse) == full_recompute(built_db, tmp_path, games)
+
+
+def test_corrected_game_rewrites_only_that_row(warehouse, built_db, tmp_path, games):
+    game_logs.apply_game_logs(warehouse, games)
+
+    corrected = games.copy()
+    first = corrected.sort_values("game_date").index[0]
+    corrected.loc[first, "pts"] += 10
+    written, refreshed, _ = game_logs.apply_game_logs(warehouse, corrected)
+
+    assert (written, refreshed) == (1, 1)
+    assert snapshot(warehouse) == full_recompute(built_db, tmp_path, corrected)
+
+
+def test_rerun_with_same_games_writes_nothing(warehouse, games):
+    game_logs.apply_game_logs(warehouse, games)
+    assert game_logs.apply_game_logs(warehouse, games)[:2] == (0, 0)
@@ -0,0 +1,77 @@
+import pandas as pd
+import pytest
+
+from player_name_matching import (
+    ALIAS_TABLE, MATCH_THRESHOLD, match_block, normalize_name, score_names,
+)
+from update_players_from_sunbelt_rosters_2024_25 import apply_roster
+
+
+@pytest.mark.parametrize("raw, normalized", [
+    ("José Núñez Jr.", "jose nunez"),
+    ("Mike O'Neal III", "michael oneal"),
+    ("  D'Andre   Smith-Jones ", "dandre smith jones"),
+])
+def test_normalize_name(raw, normalized):
+    assert normalize_name(raw) == normalized
+
+
+def test_suffix_and_accent_variants_match_as_normalized():
+    matches, _ = match_block(["Jose Nunez"], [(7, "José Núñez Jr.")])
+    assert matches == [("Jose Nunez", 7, 1.0, "normalized")]
+
+
+def test_threshold_is_inclusive():
+    score = score_names("kobe allan", "kobe allen")
+    assert MATCH_THRESHOLD <= score < 1.0
+
+    matches, _ = match_block(["Kobe Allan"], [(3, "Kobe Allen")], threshold=score)
+    assert matches == [("Kobe Allan", 3, score, "fuzzy")]
+    assert match_block(["Kobe Allan"], [(3, "Kobe Allen")], threshold=score + 1e-9)[0] == []
+
+
+def test_teammates_sharing_a_last_name_stay_apart():
+    # same blocking keys, but below the threshold
+    assert score_names("jaylen wilson", "jordan wilson") < MATCH_THRESHOLD
+    matches, comparisons = match_block(["Jaylen Wilson"], [(1, "Jordan Wilson")])
+    assert (matches, comparisons) == ([], 1)
+
+
+def test_each_player_is_claimed_once_best_score_first():
+    assert score_names("jaylen wilsn", "jaylen wilson") > score_names("jaylan wilsen", "jaylen wilson")
+    matches, _ = match_block(["Jaylan Wilsen", "Jaylen Wilsn"], [(1, "Jaylen Wilson")])
+    assert [(name, pid) for name, pid, _, _ in matches] == [("Jaylen Wilsn", 1)]
+
+
+def test_names_without_a_shared_blocking_key_are_not_compared():
+    matches, comparisons = match_block(["Tyler Todd"], [(1, "Kobe Allen")])
+    assert (matches, comparisons) == ([], 0)
+
+
+def test_fuzzy_match_is_saved_as_alias(warehouse):
+    player_id, full_name, slug = warehouse.execute(
+        """
+        SELECT p.player_id, p.full_name, t.team_slug
+        FROM players AS p JOIN teams AS t ON t.team_id = p.team_id
+        WHERE p.full_name NOT LIKE '% % %'  -- no suffix
+        ORDER BY p.player_id LIMIT 1;
+        """
+    ).fetchone()
+    misspelled = full_name + full_name[-1]
+    roster = pd.DataFrame([{
+        "player": misspelled, "team_slug": slug, "season": 2025,
+        "class_year": "GR", "height_cm": 200, "weight_kg": 100,
+    }])
+
+    updated, missing = apply_roster(warehouse, roster)
+    assert (updated, missing) == (1, [])
+    assert warehouse.execute(
+        f"SELECT player_id, method FROM {ALIAS_TABLE} WHERE alias_name = ?;",
+        (misspelled,),
+    ).fetchone() == (player_id, "fuzzy")
+    assert warehouse.execute(
+        "SELECT class_year FROM players WHERE player_id = ?;", (player_id,)
+    ).fetchone() == ("GR",)
+
+    # the next run resolves it through the alias table, without fuzzy matching
+    assert apply_roster(warehouse, roster, fuzzy=False) == (1, [])
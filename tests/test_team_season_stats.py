@@ -0,0 +1,51 @@
+import init_sunbelt_v0_team_season_stats as team_stats
+
+
+def stored_hashes(conn):
+    return dict(conn.execute(
+        f"SELECT team_id, source_hash FROM {team_stats.TEAM_STATS_TABLE};").fetchall())
+
+
+def test_unchanged_source_writes_nothing(warehouse):
+    before = stored_hashes(warehouse)
+    assert len(before) == 4
+    assert team_stats.refresh_team_stats(warehouse)[:2] == (0, 0)
+    assert stored_hashes(warehouse) == before
+
+
+def test_changed_player_line_rewrites_only_its_team(warehouse):
+    before = stored_hashes(warehouse)
+    team_slug, player, pts = warehouse.execute(
+        f"SELECT team_slug, player, pts FROM {team_stats.STATS_TABLE} LIMIT 1;").fetchone()
+    with warehouse:
+        warehouse.execute(
+            f"UPDATE {team_stats.STATS_TABLE} SET pts = ? WHERE team_slug = ? AND player = ?;",
+            (pts + 1.0, team_slug, player))
+
+    assert team_stats.refresh_team_stats(warehouse)[:2] == (1, 0)
+    after = stored_hashes(warehouse)
+    team_id = warehouse.execute(
+        "SELECT team_id FROM teams WHERE team_slug = ?;", (team_slug,)).fetchone()[0]
+    assert {k for k in before if before[k] != after[k]} == {team_id}
+
+
+def test_hash_ignores_row_order(warehouse):
+    source = team_stats.load_source(warehouse)
+    shuffled = source.sample(frac=1.0, random_state=1).reset_index(drop=True)
+    assert (team_stats.compute_team_stats(source)["source_hash"].tolist()
+            == team_stats.compute_team_stats(shuffled)["source_hash"].tolist())
+
+
+def test_formula_version_bump_rewrites_every_team(warehouse, monkeypatch):
+    monkeypatch.setattr(team_stats, "FORMULA_VERSION", team_stats.FORMULA_VERSION + 1)
+    assert team_stats.refresh_team_stats(warehouse)[:2] == (4, 0)
+    assert team_stats.refresh_team_stats(warehouse)[:2] == (0, 0)
+
+
+def test_vanished_team_is_deleted(warehouse):
+    team_slug = warehouse.execute("SELECT team_slug FROM teams LIMIT 1;").fetchone()[0]
+    with warehouse:
+        warehouse.execute(
+            f"DELETE FROM {team_stats.STATS_TABLE} WHERE team_slug = ?;", (team_slug,))
+    assert team_stats.refresh_team_stats(warehouse)[:2] == (0, 1)
+    assert len(stored_hashes(warehouse)) == 3
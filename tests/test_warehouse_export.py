@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from warehouse_export import export_datasets, read_export, read_manifest, sha256_file
+
+
+def test_manifest_describes_written_partitions(warehouse, tmp_path):
+    results = export_datasets(warehouse, out_dir=tmp_path)
+
+    profiles = warehouse.execute(
+        "SELECT COUNT(*) FROM sun_belt_player_profile_2024_25;").fetchone()[0]
+    assert results["profiles"] == {"rows": profiles, "written": 1, "skipped": 0, "removed": 0}
+
+    for name, result in results.items():
+        manifest = read_manifest(tmp_path, name)
+        assert manifest["format"] == "parquet"
+        assert manifest["rows"] == result["rows"] == sum(p["rows"] for p in manifest["partitions"])
+        for part in manifest["partitions"]:
+            path = tmp_path / name / part["path"]
+            assert path.stat().st_size == part["bytes"]
+            assert sha256_file(path) == part["file_sha256"]
+        df = read_export(name, out_dir=tmp_path)
+        assert len(df) == manifest["rows"]
+        assert list(df.columns) == [c["name"] for c in manifest["columns"]]
+
+
+def test_reexport_rewrites_only_changed_data(warehouse, tmp_path):
+    export_datasets(warehouse, fmt="csv.gz", out_dir=tmp_path)
+    assert all(r["written"] == 0 and r["skipped"] == 1
+               for r in export_datasets(warehouse, fmt="csv.gz", out_dir=tmp_path).values())
+
+    with warehouse:
+        warehouse.execute("UPDATE players SET height_cm = 250;")
+    results = export_datasets(warehouse, fmt="csv.gz", out_dir=tmp_path)
+    assert results["profiles"]["written"] == 1
+    assert results["comps"]["written"] == 0
+
+
+def test_same_snapshot_version_skips_without_querying(warehouse, tmp_path):
+    export_datasets(warehouse, out_dir=tmp_path, source_version="v1")
+    assert read_manifest(tmp_path, "profiles")["source_version"] == "v1"
+
+    closed = sqlite3.connect(":memory:")
+    closed.close()
+    results = export_datasets(closed, out_dir=tmp_path, source_version="v1")
+    assert all(r["written"] == 0 and r["skipped"] == 1 for r in results.values())
+
+    # a new version, a different format or a damaged file all need the source
+    for kwargs in ({"source_version": "v2"}, {"source_version": "v1", "fmt": "csv.gz"}):
+        with pytest.raises(sqlite3.ProgrammingError):
+            export_datasets(closed, out_dir=tmp_path, **kwargs)
+    manifest = read_manifest(tmp_path, "comps")
+    (tmp_path / "comps" / manifest["partitions"][0]["path"]).write_bytes(b"")
+    with pytest.raises(sqlite3.ProgrammingError):
+        export_datasets(closed, ["comps"], out_dir=tmp_path, source_version="v1")
+
+    results = export_datasets(warehouse, ["comps"], out_dir=tmp_path, source_version="v1")
+    assert results["comps"]["written"] == 1
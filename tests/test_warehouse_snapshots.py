@@ -0,0 +1,142 @@
+import os
+import sqlite3
+
+import pytest
+
+import warehouse_snapshots as snapshots
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """Point the snapshot module at a temp db/ dir."""
+    db_path = tmp_path / "db" / "ncaa_dev.db"
+    db_path.parent.mkdir()
+    snapshot_dir = db_path.parent / "snapshots"
+    monkeypatch.setattr(snapshots, "DB_PATH", db_path)
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", snapshot_dir)
+    monkeypatch.setattr(snapshots, "CURRENT_POINTER", snapshot_dir / "CURRENT")
+    monkeypatch.setattr(snapshots, "STAGING_PATH", db_path.with_name("ncaa_dev.staging.db"))
+    monkeypatch.delenv(snapshots.STAGING_ENV, raising=False)
+    return snapshot_dir
+
+
+def live_player_count() -> int:
+    conn = sqlite3.connect(f"file:{snapshots.DB_PATH}?mode=ro", uri=True)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM players;").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_publish_and_rollback_round_trip(warehouse, snapshot_dir):
+    first = snapshots.publish_snapshot(warehouse)
+    assert snapshots.current_version() == first
+    assert snapshots.published_version(snapshots.DB_PATH) == first
+    players = live_player_count()
+
+    team_id = warehouse.execute("SELECT team_id FROM teams LIMIT 1;").fetchone()[0]
+    with warehouse:
+        warehouse.execute(
+            "INSERT INTO players (full_name, team_id, season) VALUES ('New Guy', ?, 2025);",
+            (team_id,))
+    second = snapshots.publish_snapshot(warehouse)
+    assert second > first
+    assert snapshots.read_manifest(second)["previous_version"] == first
+    assert live_player_count() == players + 1
+
+    assert snapshots.rollback() == first
+    assert snapshots.current_version() == first
+    assert live_player_count() == players
+
+    assert snapshots.rollback(second) == second
+    assert live_player_count() == players + 1
+
+
+def test_rollback_without_older_snapshot_fails(warehouse, snapshot_dir):
+    snapshots.publish_snapshot(warehouse)
+    with pytest.raises(ValueError, match="No older snapshot"):
+        snapshots.rollback()
+    with pytest.raises(ValueError, match="Unknown snapshot version"):
+        snapshots.rollback("19990101T000000000000")
+
+
+def test_failed_validation_keeps_live_snapshot(warehouse, snapshot_dir):
+    live = snapshots.publish_snapshot(warehouse)
+    with warehouse:
+        warehouse.execute("DELETE FROM player_similarity_sun_belt_2024_25;")
+
+    with pytest.raises(ValueError, match="player_similarity_sun_belt_2024_25 is empty"):
+        snapshots.publish_snapshot(warehouse)
+    assert snapshots.list_versions() == [live]
+    assert snapshots.current_version() == live
+    assert not list(snapshot_dir.glob("*.building"))
+
+
+def test_validation_rejects_shrinking_relation(warehouse):
+    counts = snapshots.validate_snapshot(warehouse, {})
+    assert counts["players"] > 0
+
+    bigger = dict(counts, players=round(counts["players"] / snapshots.MIN_ROW_RATIO) + 1)
+    with pytest.raises(ValueError, match="players shrank"):
+        snapshots.validate_snapshot(warehouse, bigger)
+
+
+def test_prune_keeps_newest_and_live(warehouse, snapshot_dir):
+    versions = [snapshots.publish_snapshot(warehouse, keep=10) for _ in range(4)]
+    snapshots.rollback(versions[0])
+
+    assert snapshots.prune_snapshots(keep=2) == [versions[1]]
+    assert snapshots.list_versions() == [versions[0], *versions[2:]]
+    with pytest.raises(ValueError):
+        snapshots.prune_snapshots(keep=0)
+
+
+def test_step_scripts_refuse_published_db(warehouse, snapshot_dir, monkeypatch):
+    snapshots.publish_snapshot(warehouse)
+    assert snapshots.is_published(snapshots.DB_PATH)
+    with pytest.raises(RuntimeError, match="published snapshot"):
+        snapshots.check_writable(snapshots.DB_PATH)
+    with pytest.raises(SystemExit):
+        snapshots.connect_writable(snapshots.DB_PATH)
+
+    # the DAG runner's path: write a staged copy, then publish it
+    staging = snapshots.start_staging(snapshots.STAGING_PATH)
+    monkeypatch.setenv(snapshots.STAGING_ENV, str(staging))
+    conn = snapshots.connect_writable(snapshots.DB_PATH)
+    try:
+        assert os.path.samefile(conn.execute("PRAGMA database_list;").fetchone()[2], staging)
+        snapshots.publish_snapshot(conn)
+    finally:
+        conn.close()
+    assert len(snapshots.list_versions()) == 2
+
+
+@pytest.mark.parametrize("failed", [False, True])
+def test_runner_publishes_staged_copy_only_when_every_stage_ran(
+        warehouse, snapshot_dir, failed):
+    from run_sunbelt_2024_25_pipeline import StageResult, publish_staging
+
+    live = snapshots.publish_snapshot(warehouse)
+    players = live_player_count()
+    staging = snapshots.start_staging(snapshots.STAGING_PATH)
+    conn = sqlite3.connect(staging)
+    with conn:
+        conn.execute("UPDATE players SET class_year = 'SR';")
+    conn.close()
+
+    results = [StageResult("schema", "ran"), StageResult("similarity", "ran")]
+    if failed:
+        results.append(StageResult("export", "failed"))
+    outcome = publish_staging(staging, results, keep=5)
+
+    assert not staging.exists()
+    assert live_player_count() == players
+    if failed:
+        assert outcome.status == "skipped"
+        assert snapshots.current_version() == live
+    else:
+        assert outcome.status == "ran"
+        assert snapshots.current_version() != live
+        conn = sqlite3.connect(f"file:{snapshots.DB_PATH}?mode=ro", uri=True)
+        assert conn.execute("SELECT DISTINCT class_year FROM players;").fetchall() == [("SR",)]
+        conn.close()